@@ -4,26 +4,151 @@ from __future__ import annotations
 
 import threading
 import time
+import gc
 import sys
-#import carla # DO NOT IMPORT HERE!!!
+import importlib
+#import carla # DO NOT IMPORT HERE!!! the egg path depends on the selected version,
+              # carla is imported once via _import_carla() on connect (type hints: TYPE_CHECKING below)
 import queue
-import pygame
-from timeit import default_timer as timer
-
-from concurrent.futures import ThreadPoolExecutor
-from collections import Counter
+import collections
+import numpy as np
 
 from typing import Optional, Any, TYPE_CHECKING
-from PyQt5.QtCore import QObject, pyqtSignal, pyqtSlot
+from PyQt5.QtCore import QObject, QTimer, pyqtSignal, pyqtSlot
 
 from hse.data_manager import DataManager
-from hse.utils.settings import CAMERA_POSITIONS, CARLA_DIR, CARLA_FPS, SGG_DIR, SGG_FPS, SGG_RENDER_DIST, QUEUE_WORKER_COUNT
+from hse.utils.ring_buffer import SpscRingBuffer
+from hse.utils import camera_math
+from hse.utils.camera_math import world_offset
+from hse.utils.settings import (
+    CAMERA_POSITIONS, CARLA_DIR, CARLA_FIXED_DELTA, CARLA_TICK_TIMEOUT, CARLA_FPS, SGG_DIR, SGG_FPS, SGG_RENDER_DIST,
+    RECORD_QUEUE_SIZE, PERSIST_INTERVAL, ERROR_LOG_SIZE, ERROR_LOG_INTERVAL_MS,
+    FRAME_PROGRESS_INTERVAL_MS, MAX_VEHICLES,
+    SIM_JOIN_TIMEOUT, PERSIST_JOIN_TIMEOUT, RECORD_JOIN_TIMEOUT
+)
 
 
 if TYPE_CHECKING:
     import carla    # only for Typecheck
 
 
+# VehicleControl attributes copied into the ego_control dict of each recorded frame
+_CONTROL_FIELDS = ("throttle", "steer", "brake", "hand_brake", "reverse", "manual_gear_shift", "gear")
+
+# CAMERA_POSITIONS flattened once at import, indexed by int:
+# _CAMERA_KEYS[i] -> key, _CAMERA_INDEX[key] -> i,
+# _CAMERA_OFFSETS[i] -> ((x, y, z), (pitch, yaw, roll)) or None for the free camera
+_CAMERA_KEYS  = tuple(CAMERA_POSITIONS.keys())
+_CAMERA_INDEX = {key: i for i, key in enumerate(_CAMERA_KEYS)}
+_CAMERA_OFFSETS = tuple(
+    None if cfg is None else (
+        tuple(cfg["transform"]["location"][a] for a in ("x", "y", "z")),
+        tuple(cfg["transform"]["rotation"][a] for a in ("pitch", "yaw", "roll")),
+    )
+    for cfg in CAMERA_POSITIONS.values()
+)
+
+
+def _import_carla(version: str):
+    """
+    Import the carla module of the given CARLA version exactly once per process.
+    1) Insert the CARLA .egg file into sys.path for the API
+    2) Also add the non-egg carla folder for agents
+    3) Import the module now that the paths are set
+    On every later connect the already loaded module is returned, so sys.path
+    does not grow and a second egg can never shadow the first one.
+    """
+    loaded = sys.modules.get("carla")
+    if loaded is not None:
+        return loaded
+
+    # 1) egg-Verzeichnis (enthält carla.egg ohne agents)
+    egg_dir = CARLA_DIR / version / "WindowsNoEditor" / "PythonAPI" / "carla" / "dist"
+    if egg_dir.exists():
+        eggs = sorted(egg_dir.glob("carla-*.egg"))
+        if eggs:
+            sys.path.insert(0, str(eggs[-1]))
+
+    # 2)
+    carla_pkg = CARLA_DIR / version / "WindowsNoEditor" / "PythonAPI" / "carla"
+    if carla_pkg.exists():
+        sys.path.insert(0, str(carla_pkg))
+
+    # 3)
+    return importlib.import_module("carla")
+
+
+# gc.freeze() done? (once per process, see _freeze_gc)
+_gc_frozen = False
+
+
+def _freeze_gc():
+    """
+    Move everything allocated so far (carla module, blueprints, SGG modules)
+    into the permanent generation, so the cyclic GC no longer rescans these
+    long-lived objects while the simulation runs.
+    Collect first, so no garbage gets frozen with them.
+    Only the first call does anything: frozen objects are never collected again,
+    so freezing on every connect would pin the client/world of old sessions and maps.
+    Must not run on the tick thread (the full collect pauses it).
+    """
+    global _gc_frozen
+    if _gc_frozen:
+        return
+    _gc_frozen = True
+    gc.collect()
+    gc.freeze()
+
+
+def _make_camera_fn(offsets):
+    """
+    Specialize the spectator transform for one camera preset.
+    The six offsets are captured as closure locals, so the per-tick path
+    does no dict lookups at all. The result is written into out_tf (a reused
+    carla.Transform) and returned. Returns None for the free camera.
+    """
+    if not offsets:
+        return None
+    (lx, ly, lz), (pitch, yaw, roll) = offsets
+
+    def camera_transform(actor_tf, out_tf):
+        # Vehicle transform (position + rotation) taken from the tick's world snapshot
+        base_rot = actor_tf.rotation
+        # every attribute read is a pybind11 call -> read each angle exactly once
+        b_pitch, b_yaw, b_roll = base_rot.pitch, base_rot.yaw, base_rot.roll
+
+        # Rotate the local offset into world space (compiled kernel if numba is available)
+        dx, dy, dz = world_offset(b_pitch, b_yaw, b_roll, lx, ly, lz)
+
+        # Camera position/rotation written into the connector's scratch transform
+        # (pybind11 returns references to its members -> no new carla objects per tick)
+        base_loc = actor_tf.location
+        out_loc  = out_tf.location
+        out_loc.x = base_loc.x + dx
+        out_loc.y = base_loc.y + dy
+        out_loc.z = base_loc.z + dz
+
+        out_rot = out_tf.rotation
+        out_rot.pitch = b_pitch + pitch
+        out_rot.yaw   = b_yaw   + yaw
+        out_rot.roll  = b_roll  + roll
+
+        return out_tf
+
+    return camera_transform
+
+
+# Specialized spectator transform per camera index (None = free camera)
+_CAMERA_FNS = tuple(_make_camera_fn(offsets) for offsets in _CAMERA_OFFSETS)
+
+# Hot-path signal name -> cached listener flag (see CarlaConnector._count_listener)
+_LISTENER_FLAGS = {
+    "frame_recorded":           "_has_frame_listener",
+    "camera_position_selected": "_has_camera_listener",
+    "recording_status":         "_has_recording_listener",
+}
+
+
 class CarlaConnector(QObject):
     """
     Runs in its own thread, waits for connect() to be triggered,
@@ -34,7 +159,7 @@ class CarlaConnector(QObject):
     blueprints_loaded        = pyqtSignal(list)         # emitted with list[str] of vehicle blueprints
     vehicle_model_selected   = pyqtSignal(str)          # emitted when user picks a model
     camera_position_selected = pyqtSignal(str)          # emitted when camera choice changes
-    frame_recorded           = pyqtSignal(int)          # emitted after each recorded frame
+    frame_recorded           = pyqtSignal(int)          # frames recorded in the current session, at most every FRAME_PROGRESS_INTERVAL_MS
     recording_status         = pyqtSignal(bool)
     map_changed              = pyqtSignal(str)          # from GUI 
     official_maps_loaded     = pyqtSignal(list)         # emit after _initialize_connection
@@ -43,6 +168,13 @@ class CarlaConnector(QObject):
         super().__init__()
         self.data = data_manager
 
+        # Cached "is anybody listening?" flags for signals emitted from the sim/record threads,
+        # kept up to date by connectNotify()/disconnectNotify() (connections counted per flag)
+        self._has_frame_listener     = False
+        self._has_camera_listener    = False
+        self._has_recording_listener = False
+        self._listener_counts = dict.fromkeys(_LISTENER_FLAGS.values(), 0)
+
         # Initialize all internal attributes 
         # Lock to protect client/world objects across threads
         self._lock       = threading.Lock()
@@ -51,58 +183,188 @@ class CarlaConnector(QObject):
         self._do_connect = threading.Event()
 
         # Will hold the carla.Client once connected
+        # (single reference, read without the lock; visibility via _connected)
         self._client             = None
 
+        # Set while a client/world pair is published, cleared by disconnect()
+        self._connected          = threading.Event()
+
         # Will hold the world instance after connection
         self._world              = None
 
-        # List of all spawned Actor references
-        self._spawned_vehicles   = []
-
-        # Queue for commands (e.g. "spawn") coming from GUI thread
-        self._command_queue      = queue.Queue()
-
-        # Control flag for main loop
-        self._running            = True
+        # Threads currently in a slow RPC phase (map download/parse, blueprint library,
+        # SGG setup): while > 0 the client keeps the long connect timeout, see _begin_slow_rpcs()
+        self._slow_rpc_users     = 0
+        self._timeout_lock       = threading.Lock()
+
+        # Spawned Actor references (newest last), bounded by MAX_VEHICLES
+        self._spawned_vehicles   = collections.deque(maxlen=MAX_VEHICLES)
+        # Spawns since connect/map change, picks the next spawn point round-robin
+        self._spawn_counter      = 0
+
+        # Per-world caches, refreshed on connect and map change:
+        # spawn points/spectator in _cache_world(), blueprints in _load_and_select_blueprints()
+        self._spawn_points       = []
+        self._spectator          = None
+        # vehicle blueprint id -> ActorBlueprint (empty until the blueprints are loaded)
+        self._bp_by_id: dict     = {}
+
+        # Number of spawn requests not yet handled by the simulation thread
+        # (incremented by GUI/sim thread, read-and-zeroed in _process_spawn, both under _spawn_lock)
+        self._spawn_pending      = 0
+        self._spawn_lock         = threading.Lock()
+
+        # Control flag for main loop (Event instead of a bare bool, so visibility
+        # across threads does not depend on the GIL)
+        self._running            = threading.Event()
+        self._running.set()
 
         # Have we loaded blueprints yet?
         self._blueprints_loaded  = False
+        # Selected vehicle blueprint id (None until chosen / restored from DataManager)
+        self._vehicle_model: Optional[str] = None
         
         # load a new map? coming from GUI thread per signal
         self._map_queue = queue.Queue()
 
-        # Recording state and folder
-        self._recording_active   = False
+        # Recording state (Event, shared by sim thread, record worker and GUI slots) and folder
+        self._recording_active   = threading.Event()
         self._record_base_folder = None
+        # Precombined gate for the sim loop: True only while recording AND sgg + folder are set
+        self._recording_ready    = False
 
         # SGG (scene graph) classes and instance
         self._SGGClass           = None
         self._sgg                = None
+        # SGG is not thread-safe (timestep and internal buffers are mutated by both
+        # generate_graph_for_frame and save) -> the record and save stage take turns
+        self._sgg_lock           = threading.Lock()
+
+        # SGG cadence in simulation ticks: every _sgg_every-th tick is recorded
+        # (fixed_delta_seconds makes this deterministic, no clock reads per tick)
+        self._sgg_every    = max(1, round(1.0 / (CARLA_FIXED_DELTA * SGG_FPS)))
+        # Ticks since the last SGG snapshot
+        self._tick_counter = 0
+        # Wall-clock length of one synchronous tick (pacing of _simulation_loop)
+        self._tick_period_ns  = int(CARLA_FIXED_DELTA * 1e9)
+
+        # Lock-free SPSC ring buffer for handing off frame-by-frame recording work
+        # (producer: simulation loop, consumer: the single _record_worker)
+        self._record_queue = SpscRingBuffer(RECORD_QUEUE_SIZE)
+        # Frames dropped in the current recording session because the buffer was full
+        self._record_dropped = 0
+        # Set by the producer after each push, wakes the record worker
+        self._record_event   = threading.Event()
+        # Set by shutdown(), tells the record worker to exit once the buffer is empty
+        self._shutdown_event = threading.Event()
+        # Set by the save worker once both record stages exited and everything is saved
+        self._record_drained = threading.Event()
+        # Pool of pre-built control dicts, recycled by the save worker after saving
+        # (one per frame in either stage, so steady-state recording allocates no new dicts)
+        # maxlen: dicts allocated on top (pool ran empty) are dropped again when returned
+        pool_size = 2 * RECORD_QUEUE_SIZE
+        self._ctrl_pool = collections.deque(
+            (dict.fromkeys(_CONTROL_FIELDS) for _ in range(pool_size)), maxlen=pool_size
+        )
+        # Two-stage recording pipeline on plain daemon threads:
+        #   sgg-record: graph generation (CPU, must keep up with the world state)
+        #   sgg-save:   writing the graphs to disk (I/O), fed through _save_queue
+        # The bounded save queue blocks only the record worker, never the sim loop.
+        self._save_queue    = queue.Queue(maxsize=RECORD_QUEUE_SIZE)
+        self._record_thread = threading.Thread(target=self._record_worker, daemon=True, name="sgg-record")
+        self._save_thread   = threading.Thread(target=self._save_worker, daemon=True, name="sgg-save")
+        self._record_thread.start()
+        self._save_thread.start()
+
+        # Settings changed by the connector are stored in memory at once and written
+        # to state.json by this thread, at most every PERSIST_INTERVAL seconds
+        self._persist_queue  = queue.Queue()
+        self._persist_thread = threading.Thread(target=self._persist_worker, daemon=True, name="persist")
+        self._persist_thread.start()
+
+        # Messages from the sim/record threads: appended without any I/O there,
+        # printed by the GUI thread (QTimer, the connector lives in the GUI thread)
+        self._error_log = collections.deque(maxlen=ERROR_LOG_SIZE)
+        self._error_timer = QTimer(self)
+        self._error_timer.timeout.connect(self._drain_error_log)
+        self._error_timer.start(ERROR_LOG_INTERVAL_MS)
+
+        # Recording progress: the save worker only stores how many graphs of the current
+        # session it actually wrote (plain int store), this GUI-thread timer emits
+        # frame_recorded when it changed -> no cross-thread signal posts from the worker at all
+        # (both reset by start_recording)
+        self._frames_saved   = 0
+        self._frames_emitted = 0
+        self._progress_timer = QTimer(self)
+        self._progress_timer.timeout.connect(self._emit_frame_progress)
+        self._progress_timer.start(FRAME_PROGRESS_INTERVAL_MS)
+
+        # Currently selected camera index into _CAMERA_KEYS / _CAMERA_FNS
+        # (None = nothing selected yet)
+        self._camera_idx       = None
+
+        # Camera/vehicle/pose of the last spectator update, to skip unchanged ticks
+        # (None = force the next update, e.g. after a map change)
+        self._last_cam_key = None
+
+        # Commands collected during one tick, sent with a single apply_batch()
+        # (only touched by the simulation thread, cleared after every send)
+        self._tick_cmds: list = []
+
+        # Control values as fixed float arrays (SoA) in the order of _ctrl_names:
+        # current tick and previous tick, used for rising-edge detection of buttons
+        self._ctrl_names     = tuple(self.data.get("controls", {}))
+        # One extra trailing slot that always stays 0.0 (target for functions that are not configured)
+        pad = len(self._ctrl_names)
+        self._cur_ctrl_vals  = np.zeros(pad + 1, dtype=np.float32)
+        self._prev_ctrl_vals = np.zeros(pad + 1, dtype=np.float32)
+        # Indices of the continuous driving inputs, gathered with one take() per tick
+        index = {func: i for i, func in enumerate(self._ctrl_names)}
+        self._drive_idx = np.array(
+            [index.get(func, pad) for func in ("throttle", "brake", "steering", "reverse")],
+            dtype=np.intp
+        )
 
-        # Compute the interval between SGG snapshots (in seconds) based on desired frames per second (SGG_FPS)
-        self._sgg_interval  = round(1.0 / SGG_FPS, 4)
-        # Timestamp of the last SGG snapshot
-        self._last_sgg_time = 0.0
-
-        # Queue for handing off frame-by-frame recording work
-        self._record_queue = queue.Queue()
-        # Thread pool to run the recording worker in background
-        self._executor   = ThreadPoolExecutor(max_workers=QUEUE_WORKER_COUNT)
-        # Start the recording worker in the pool
-        self._executor.submit(self._record_worker)
-
-        # Keep last values for each mapped control so we can detect button presses
-        self._last_control_values = {
-            func: 0.0
-            for func in self.data.get("controls", {})
-        }
+        # Joystick source, set by the ControlPanel (None = no driving input)
+        self._controller_manager = None
 
         # Start the main connector thread 
-        # This thread will run self._run() as long as self._running is True in a background thread.
+        # This thread will run self._run() as long as self._running is set in a background thread.
         self._thread = threading.Thread(target=self._run, daemon=True)
         self._thread.start()
 
 
+    def connectNotify(self, signal):
+        """Qt hook: a slot was connected to one of our signals -> count it."""
+        super().connectNotify(signal)
+        self._count_listener(signal, 1)
+
+
+    def disconnectNotify(self, signal):
+        """Qt hook: a slot was disconnected from one of our signals -> count it."""
+        super().disconnectNotify(signal)
+        self._count_listener(signal, -1)
+
+
+    def _count_listener(self, signal, delta: int):
+        """
+        Cache whether the hot-path signals have receivers, so emits from the
+        sim/record threads can be skipped entirely when nobody listens (headless).
+        Qt may call the notify hooks with an internal mutex held (e.g. from ~QObject
+        of a receiver), so receivers() must not be called here: the connections are
+        counted from the QMetaMethod instead. An invalid method (disconnect of
+        everything) leaves the flags as they are, an extra emit is harmless.
+        """
+        if not signal.isValid():
+            return
+        flag = _LISTENER_FLAGS.get(bytes(signal.name()).decode())
+        if flag is None:
+            return
+        count = max(0, self._listener_counts[flag] + delta)
+        self._listener_counts[flag] = count
+        setattr(self, flag, count > 0)
+
+
     def set_controller_manager(self, cm):
         """
         Store the provided ControllerManager instance so that later
@@ -122,10 +384,9 @@ class CarlaConnector(QObject):
     def get_client(self) -> Optional[carla.Client]:
         """
         Return the active carla.Client, or None if not connected.
-        This is thread-safe thanks to the lock.
+        A single reference read is atomic, so no lock is needed.
         """
-        with self._lock:
-            return self._client
+        return self._client
 
 
     def shutdown(self):
@@ -133,38 +394,66 @@ class CarlaConnector(QObject):
         Gracefully shut down the connector:
         1) Disconnect from the CARLA server (reset sync mode, clear client).
         2) Stop the main loop thread.
-        3) Shut down the recording worker executor.
+        3) Flush pending settings (persist thread).
+        4) Stop the recording threads (generation + save).
+        May run on any thread; the GUI thread calls stop_reporting() afterwards.
         """
         # 1) Delegate CARLA‐specific teardown to disconnect()
         #    (this will disable sync mode, reset TrafficManager, clear self._client and emit the signal)
         self.disconnect()
 
         # 2) Stop the simulation loop
-        #    Setting _running=False causes _simulation_loop to exit at its next iteration.
-        self._running = False
+        #    Clearing _running causes _simulation_loop to exit at its next iteration.
+        self._running.clear()
+        # Wake the thread if it is still blocked in _wait_for_connect()
+        self._do_connect.set()
         if hasattr(self, "_thread") and self._thread.is_alive():
             # Wait briefly for the thread to finish
-            self._thread.join(timeout=1.0)
+            self._thread.join(timeout=SIM_JOIN_TIMEOUT)
+
+        # 3) Write pending settings and stop the persist thread
+        self._persist_queue.put(None)
+        if hasattr(self, "_persist_thread") and self._persist_thread.is_alive():
+            self._persist_thread.join(timeout=PERSIST_JOIN_TIMEOUT)
+
+        # 4) Stop the recording workers
+        #    Wake the record worker so it drains the buffer and exits (it then ends
+        #    the save worker), and wait (bounded) until the queued graphs are saved.
+        self._shutdown_event.set()
+        self._record_event.set()
+        if hasattr(self, "_record_thread") and self._record_thread.is_alive():
+            self._record_thread.join(timeout=RECORD_JOIN_TIMEOUT)
+        if hasattr(self, "_save_thread") and self._save_thread.is_alive():
+            self._save_thread.join(timeout=RECORD_JOIN_TIMEOUT)
 
-        # 3) Shut down the recording worker pool
-        #    wait=True blocks until all queued recording tasks have completed.
-        if hasattr(self, "_executor"):
-            self._executor.shutdown(wait=True)
-        
         print("Connector says goodbye!")
 
 
+    @pyqtSlot()
+    def stop_reporting(self):
+        """
+        GUI thread, after shutdown(): stop the progress and error-log timers
+        and print what the workers logged last. The error log is only ever
+        drained here, so it never races with the timer.
+        """
+        self._progress_timer.stop()
+        self._error_timer.stop()
+        self._drain_error_log()
+
+
     @pyqtSlot(str)
     def set_vehicle_model(self, model_id: str):
         """
         Invoked by the UI when the user selects a blueprint ID.
-        Store it under lock, persist via DataManager, and emit a signal so
-        the ControlPanel can update its label and enable the spawn button.
+        Store it (single reference store, no lock needed), persist via DataManager,
+        and emit a signal so the ControlPanel can update its label and enable the spawn button.
+        Re-selecting the current model does nothing.
         """
-        with self._lock:
-            self._vehicle_model = model_id
-            # persist
-            self.data.set("model", model_id)
+        if model_id == self._vehicle_model:
+            return
+        self._vehicle_model = model_id
+        # persist (coalesced by the persist thread)
+        self._persist("model", model_id)
         # UI update
         self.vehicle_model_selected.emit(model_id)
 
@@ -173,29 +462,35 @@ class CarlaConnector(QObject):
     def spawn_vehicle(self):
         """
         Called by the UI thread when the user clicks “Spawn”.
-        Places a simple string command into the queue for the connector thread
-        to pick up and actually spawn the vehicle in context.
+        Counts the request; the connector thread picks it up and actually
+        spawns the vehicle in context.
         """
-        self._command_queue.put("spawn")    
+        self._request_spawn()
+
+
+    def _request_spawn(self):
+        """Register one more pending spawn (thread-safe)."""
+        with self._spawn_lock:
+            self._spawn_pending += 1
 
 
     @pyqtSlot(str)
     def set_camera_position(self, cam_id: str):
         """
         UI-triggered slot when user picks a camera view.
-        Validate cam_id, store it under lock, persist, emit signal,
-        and immediately apply the new camera if in a running world.
+        Validate cam_id, store it under lock, persist and emit signal.
+        The new camera is applied by the simulation loop on the next tick.
         """
-        if cam_id not in CAMERA_POSITIONS:
+        idx = _CAMERA_INDEX.get(cam_id)
+        # unknown key or re-selection of the current camera -> nothing to do
+        if idx is None or idx == self._camera_idx:
             return
-        with self._lock:
-            self._camera_selected = cam_id
+        self._select_camera(idx)
         # update state
-        self.data.set("camera_selected", cam_id)
+        self._persist("camera_selected", cam_id)
         # UI update
         self.camera_position_selected.emit(cam_id)   
-        # set new cam (if there is a spawned vehicle)
-        self._apply_camera()   
+        # the simulation loop places the spectator with the next tick
 
 
     def disconnect(self):
@@ -205,10 +500,7 @@ class CarlaConnector(QObject):
         """
         # ① Sync-Modus ausschalten
         if hasattr(self, "_world") and self._world:
-            settings = self._world.get_settings()
-            settings.synchronous_mode    = False
-            settings.fixed_delta_seconds = 0.0
-            self._world.apply_settings(settings)
+            self._apply_world_settings(self._world, synchronous=False)
 
         # ② Traffic Manager zurücksetzen
         if hasattr(self, "_client") and self._client:
@@ -218,9 +510,11 @@ class CarlaConnector(QObject):
             except Exception:
                 pass
 
-        # ③ echten Disconnect
-        with self._lock:
-            self._client = None
+        # ③ echten Disconnect (clear the event first so the sim loop stops using the client)
+        self._recording_ready = False
+        self._connected.clear()
+        self._client = None
+        self._spectator = None
         self.connection_result.emit(False, "Disconnected")
 
 
@@ -231,17 +525,41 @@ class CarlaConnector(QObject):
         Create a fresh folder, instantiate the SGG generator if needed,
         and flip the recording flags.
         """
+        # 0) SGG modules are still loading (or failed) -> no recording possible yet
+        if self._SGGClass is None:
+            self._log_error("SGG noch nicht geladen –> Recording nicht gestartet.")
+            return
+        if self._sgg is None and self._client is None:
+            self._log_error("Nicht verbunden –> Recording nicht gestartet.")
+            return
+
         # 1) Get a timestamped folder from DataManager
         folder = self.data.get_next_record_folder()
         self._record_base_folder = folder
 
-        # 2) Instantiate the SGG class once
+        # 2) Instantiate the SGG class once (reads the map -> long timeout meanwhile)
         if self._sgg is None:
-            self._sgg = self._SGGClass(self._client)
-
-        # 3) Update state in both DataManager and locally
-        self._recording_active = True
-        self.recording_status.emit(True)
+            client = self._client
+            self._begin_slow_rpcs(client)
+            try:
+                self._sgg = self._SGGClass(client)
+            finally:
+                self._end_slow_rpcs(client)
+            # not frozen: start_recording may run on the tick thread (joystick toggle),
+            # a full gc.collect() there would stall the simulation
+
+        # 3) New session -> count from 0; emitted value -1 makes the timer report the 0
+        self._frames_saved   = 0
+        self._frames_emitted = -1
+
+        # 4) Update state in both DataManager and locally
+        # first tick after opening the gate records immediately (gate is still closed here)
+        self._tick_counter = self._sgg_every - 1
+        self._recording_active.set()
+        # everything the sim loop needs is in place -> open the gate
+        self._recording_ready = True
+        if self._has_recording_listener:
+            self.recording_status.emit(True)
     
 
     @pyqtSlot()
@@ -250,42 +568,178 @@ class CarlaConnector(QObject):
         End the recording session when the user clicks “Stop Recording”.
         Clears flags so no more SGG snapshots are taken.
         """
-        self._recording_active = False
-        self.recording_status.emit(False)
+        # close the gate first so the sim loop stops before the folder is cleared
+        self._recording_ready = False
+        self._recording_active.clear()
+        if self._has_recording_listener:
+            self.recording_status.emit(False)
         self._record_base_folder = None
+        if self._record_dropped:
+            print(f"Recording beendet –> insgesamt {self._record_dropped} Frames übersprungen (Record buffer voll).")
+            self._record_dropped = 0
 
 
     def get_recording_status(self):
-        return self._recording_active
+        return self._recording_active.is_set()
 
 
     def _record_worker(self):
-        while self._running:
-            # 1) Versuche ein Task mit Timeout zu holen
+        """
+        Single consumer of the record ring buffer (generation stage).
+        Sleeps on _record_event until the producer signals new frames, then
+        drains the buffer. After shutdown() set _shutdown_event, the remaining
+        items are processed and the save worker is told to finish (None).
+        """
+        while True:
+            # 1) Block until frames were pushed (or shutdown was requested)
+            self._record_event.wait()
+            # clear BEFORE draining, so a push during the drain re-arms the event
+            self._record_event.clear()
+
+            # 2) Drain everything that is queued right now
+            task = self._record_queue.pop()
+            while task is not None:
+                self._process_record_task(task)
+                task = self._record_queue.pop()
+
+            # 3) Stop only once shutdown is requested and nothing is left
+            if self._shutdown_event.is_set() and self._record_queue.empty():
+                break
+
+        self._save_queue.put(None)
+
+
+    def _save_worker(self):
+        """
+        Save stage: write each generated graph to disk, recycle its
+        control dict and report progress to the UI.
+        A None item (end of the record worker) ends the thread.
+        """
+        # graphs written per recording folder (= session), only touched by this thread
+        count_folder, count = None, 0
+        while True:
+            item = self._save_queue.get()
+            if item is None:
+                break
+            frame, sg, control_dict, folder = item
+            saved = False
             try:
-                frame, ego_id, control_dict, folder = self._record_queue.get(timeout=0.5)
-            except queue.Empty:
-                # Keine Tasks gerade → wieder von vorn
+                with self._sgg_lock:
+                    self._sgg.save(sg, folder)
+                saved = True
+            except Exception as e:
+                self._log_error(f"Fehler beim Speichern von Frame {frame}: {e}")
+            finally:
+                # graph is written (or failed) -> the control dict can be reused
+                self._ctrl_pool.append(control_dict)
+
+            if saved:
+                if folder != count_folder:
+                    count_folder, count = folder, 0
+                count += 1
+                # frames on disk for the running session (SGG.timestep counts generated
+                # frames); graphs of a stopped session may still drain -> not reported.
+                # Picked up by _emit_frame_progress on the GUI thread
+                if folder == self._record_base_folder:
+                    self._frames_saved = count
+
+        self._record_drained.set()
+
+
+    def _log_error(self, message: str):
+        """
+        Record a message from a worker or the sim thread without touching stdout
+        (deque.append is thread-safe; the oldest entries drop once ERROR_LOG_SIZE is reached).
+        """
+        self._error_log.append((time.monotonic(), message))
+
+
+    @pyqtSlot()
+    def _drain_error_log(self):
+        """GUI thread: print all collected messages, merging repeats of the same text."""
+        last, repeats = None, 0
+        while self._error_log:
+            _, message = self._error_log.popleft()
+            if message == last:
+                repeats += 1
                 continue
+            if repeats:
+                print(f"  (x{repeats + 1})")
+            print(message)
+            last, repeats = message, 0
+        if repeats:
+            print(f"  (x{repeats + 1})")
 
-            # 2) Jetzt haben wir ein echtes Item, also hier verarbeiten...
-            try:
+
+    @pyqtSlot()
+    def _emit_frame_progress(self):
+        """GUI thread: emit frame_recorded once per interval if new frames were saved."""
+        saved = self._frames_saved
+        if saved != self._frames_emitted:
+            self._frames_emitted = saved
+            if self._has_frame_listener:
+                self.frame_recorded.emit(saved)
+
+
+    def _persist(self, key: str, value: Any):
+        """
+        Update a setting in the DataManager immediately (readers see it at once)
+        and let the persist thread write it to disk.
+        """
+        self.data.set(key, value, save=False)
+        self._persist_queue.put(key)
+
+
+    def _persist_worker(self):
+        """
+        Coalesce pending setting changes into one state.json write.
+        Blocks until a change arrives, takes everything queued meanwhile,
+        saves once and then waits PERSIST_INTERVAL before the next write.
+        A None item (from shutdown) flushes and ends the thread.
+        """
+        running = True
+        while running:
+            # 1) Wait for the first change
+            key = self._persist_queue.get()
+            if key is None:
+                running = False
+            # 2) Swallow everything that piled up meanwhile
+            while True:
+                try:
+                    key = self._persist_queue.get_nowait()
+                except queue.Empty:
+                    break
+                if key is None:
+                    running = False
+            # 3) One write for all of them
+            self.data.save()
+            if running:
+                time.sleep(PERSIST_INTERVAL)
+
+
+    def _process_record_task(self, task):
+        """
+        Generate the scene graph for one queued frame and hand it to the save worker.
+        """
+        frame, ego_id, control_dict, folder = task
+        try:
+            with self._sgg_lock:
                 self._sgg.ego_id = ego_id
                 sg = self._sgg.generate_graph_for_frame(
                     frame_num=frame,
                     ego_control=control_dict,
                     render_dist=SGG_RENDER_DIST
                 )
-                self._sgg.save(sg, folder)
-                try:
-                    self.frame_recorded.emit(self._sgg.timestep)
-                except Exception:
-                    pass
-            except Exception as e:
-                print(f"Fehler beim Aufzeichnen von Frame {frame}: {e}")
-            finally:
-                # 3) task_done() NUR aufrufen, wenn wir wirklich ein Item hatten
-                self._record_queue.task_done()
+        except Exception as e:
+            self._log_error(f"Fehler beim Aufzeichnen von Frame {frame}: {e}")
+            self._ctrl_pool.append(control_dict)
+            return
+        # the graph may still reference control_dict -> recycled after saving
+        # (blocks only if the disk is RECORD_QUEUE_SIZE frames behind)
+        self._save_queue.put((frame, sg, control_dict, folder))
+        # Hand the GIL back after every graph, so the tick thread does not
+        # wait a full switch interval behind the worker
+        time.sleep(0)
 
 
     def _run(self):
@@ -297,6 +751,9 @@ class CarlaConnector(QObject):
         """
         # 1)
         self._wait_for_connect()
+        # woken up by shutdown() instead of connect()?
+        if not self._running.is_set():
+            return
         # 2)
         if not self._initialize_connection():
             return 
@@ -316,110 +773,198 @@ class CarlaConnector(QObject):
         Returns False if any step fails.
         """
         try:
-            # 1) Insert the CARLA .egg file into sys.path for API + agents
-            version = self.data.get("carla_version")
-            # egg-Verzeichnis (enthält carla.egg ohne agents)
-            egg_dir = CARLA_DIR / version / "WindowsNoEditor" / "PythonAPI" / "carla" / "dist"
-            if egg_dir.exists():
-                eggs = sorted(egg_dir.glob("carla-*.egg"))
-                if eggs:
-                    sys.path.insert(0, str(eggs[-1]))
-
-            # 2) Also add the non-egg carla folder for agents
-            carla_pkg = CARLA_DIR / version / "WindowsNoEditor" / "PythonAPI" / "carla"
-            if carla_pkg.exists():
-                sys.path.insert(0, str(carla_pkg))
-
-            # 3) Import the CARLA module now that paths are set
-            import importlib
-            self.carla = importlib.import_module("carla")
+            # 1)-3) Egg path for the selected version + import (only done once per process)
+            self.carla = _import_carla(self.data.get("carla_version"))
+            # One VehicleControl reused by _process_control on every tick
+            self._vehicle_control = self.carla.VehicleControl()
+            # carla.command namespace for the per-tick batch
+            self._cmd = self.carla.command
+            # Scratch spectator transform, overwritten by the camera function on every update
+            self._scratch_tf = self.carla.Transform(self.carla.Location(), self.carla.Rotation())
+            # Compile the camera kernel now, not on the first tick
+            camera_math.warm_up()
 
             # 4) Create the client and world, apply sync settings
             host = self.data.get("host")
             port = self.data.get("port")
             version = self.data.get("carla_version")
+            # The RPC socket lives in LibCarla (C++/rpclib), not in Python's socket module:
+            # TCP options such as TCP_NODELAY cannot be set (or monkey-patched) from here.
+            # Round-trips are kept low instead by batching commands per tick (_tick_cmds).
             client = self.carla.Client(host, port)
-            client.set_timeout(self.data.get("timeout", 10.0))
+            # connect timeout until the slow connect RPCs are done (step 10)
+            self._begin_slow_rpcs(client)
 
             world = client.get_world()
 
             # Sync + fixed delta
-            settings = world.get_settings()
-            settings.synchronous_mode    = True
-            settings.fixed_delta_seconds = 0.01 #recommended from CARLA -> DO NOT INCREASE or physics become weird!
-            world.apply_settings(settings)
-
-            # 5) Configure the Traffic Manager for sync mode
-            tm = client.get_trafficmanager()
-            tm.set_synchronous_mode(True)
+            self._apply_world_settings(world, synchronous=True)
 
-            # 6) Save client/world under lock and notify GUI success
+            # 5) Save client/world under lock and notify GUI success right away
             with self._lock:
                 self._client = client
                 self._world  = world
             self.connection_result.emit(True, f"Connected to {host}:{port} (version {version})")
 
-            # 7) Load available blueprints & notify UI
-            self._load_and_select_blueprints(world)
+            # 6) Configure the Traffic Manager for sync mode
+            tm = client.get_trafficmanager()
+            tm.set_synchronous_mode(True)
+            self._connected.set()
+
+            # 7) Cache spawn points/spectator (get_map() downloads and parses the OpenDRIVE map)
+            self._cache_world(world)
 
             # 8) Auto-select previously saved camera position
             self._auto_select_camera(world)
 
-            # 9) Prepare the SGG package import 
-            # If the SGG repo folder exists, insert it into sys.path so we can import it.
-            if SGG_DIR.exists():
-                sys.path.insert(0, str(SGG_DIR))
-            # Dynamically import carla_sgg.sgg to get the SGG class
-            import importlib
-            sgg_mod = importlib.import_module("carla_sgg.sgg")
-            self._SGGClass = sgg_mod.SGG
-
-            # Prepare SGG abstractor functions 
-            # Import the abstractor utilities that process simulation state into graphs.
-            # process_to_rsv: full scene graph (Entities + Lanes + Relations)
-            # EgoNotInLaneException: raised when ego-vehicle is outside any lane
-            from carla_sgg.sgg_abstractor import (
-                process_to_rsv,           # RSV = Entities + Lanes + Relations
-                entities   as E,          # E   = Entities only
-                semgraph   as EL,         # EL  = Entities + Lanes
-                process_to_rsv as ER,     # ER  = Entities + Relations only
-                EgoNotInLaneException
-            )
-            # The connector can now use these functions to build and filter graphs as needed.
-            self._abstract_rsv       = process_to_rsv
-            self._abstract_entities  = E
-            self._abstract_semgraph  = EL
-            self._abstract_er        = ER
-            self._ego_not_in_lane_ex = EgoNotInLaneException
-            
             #Scan for official Maps
             # Offizielle Maps per CARLA-API abfragen (korrigiert den EmptyMap-Bug)
             raw = client.get_available_maps()
             # raw = ['/Game/Carla/Maps/Town01', …]
             self.official_maps = [p.rsplit('/', 1)[-1] for p in raw]
             self.official_maps_loaded.emit(self.official_maps)        
-                     
+
+            # 9) The blueprint library (large RPC) and the SGG modules are loaded in the
+            #    background, so the loop can start ticking meanwhile; the preload thread
+            #    holds the long timeout until it is done
+            self._begin_slow_rpcs(client)
+            threading.Thread(
+                target=self._preload, args=(client, world), daemon=True, name="preload"
+            ).start()
+
+            # 10) Connect RPCs done -> short timeout for the per-tick RPCs as soon as
+            #     the preload is done too, so a hung server is noticed in seconds
+            self._end_slow_rpcs(client)
             return True
         except Exception as e:
+            # leave nothing half connected behind: _run returns after this
+            self._connected.clear()
+            with self._lock:
+                self._client = None
+                self._world  = None
+            with self._timeout_lock:
+                self._slow_rpc_users = 0
             self.connection_result.emit(False, f"Connection failed: {e}")
             return False
 
 
+    def _begin_slow_rpcs(self, client):
+        """
+        Enter a phase of slow RPCs (map download/parse, blueprint library, SGG setup):
+        the client uses the long connect timeout ("timeout" in the state) until
+        the matching _end_slow_rpcs(). The timeout is per client, not per thread,
+        so overlapping phases (preload + map change) are counted.
+        """
+        with self._timeout_lock:
+            self._slow_rpc_users += 1
+            client.set_timeout(self.data.get("timeout", 10.0))
+
+
+    def _end_slow_rpcs(self, client):
+        """Leave a slow RPC phase; the last one restores the short CARLA_TICK_TIMEOUT."""
+        with self._timeout_lock:
+            self._slow_rpc_users = max(0, self._slow_rpc_users - 1)
+            if self._slow_rpc_users == 0:
+                client.set_timeout(CARLA_TICK_TIMEOUT)
+
+
+    def _preload(self, client, world):
+        """
+        Background part of the connect: vehicle blueprints first (the UI waits
+        for them), then the SGG modules (only needed once recording starts).
+        Ends the slow RPC phase that _initialize_connection() opened for it.
+        """
+        try:
+            self._load_and_select_blueprints(world)
+            try:
+                self._load_sgg_modules()
+            except Exception as e:
+                self._log_error(f"SGG konnte nicht geladen werden: {e}")
+        finally:
+            self._end_slow_rpcs(client)
+        # first connect is complete -> keep its objects out of later GC passes
+        # (preload thread, never the tick thread; once per process)
+        _freeze_gc()
+
+
+    def _load_sgg_modules(self):
+        """
+        Import the SGG class and abstractor functions once per process;
+        later connects reuse them.
+        """
+        if self._SGGClass is not None:
+            return
+
+        # If the SGG repo folder exists, insert it into sys.path so we can import it.
+        if SGG_DIR.exists() and str(SGG_DIR) not in sys.path:
+            sys.path.insert(0, str(SGG_DIR))
+        # Dynamically import carla_sgg.sgg to get the SGG class
+        sgg_mod = importlib.import_module("carla_sgg.sgg")
+
+        # Prepare SGG abstractor functions 
+        # Import the abstractor utilities that process simulation state into graphs.
+        # process_to_rsv: full scene graph (Entities + Lanes + Relations)
+        # EgoNotInLaneException: raised when ego-vehicle is outside any lane
+        from carla_sgg.sgg_abstractor import (
+            process_to_rsv,           # RSV = Entities + Lanes + Relations
+            entities   as E,          # E   = Entities only
+            semgraph   as EL,         # EL  = Entities + Lanes
+            process_to_rsv as ER,     # ER  = Entities + Relations only
+            EgoNotInLaneException
+        )
+        # The connector can now use these functions to build and filter graphs as needed.
+        self._abstract_rsv       = process_to_rsv
+        self._abstract_entities  = E
+        self._abstract_semgraph  = EL
+        self._abstract_er        = ER
+        self._ego_not_in_lane_ex = EgoNotInLaneException
+        # published last: _SGGClass != None means everything above is ready
+        self._SGGClass = sgg_mod.SGG
+
+
+    def _apply_world_settings(self, world, synchronous: bool):
+        """
+        Switch the world between synchronous mode (fixed delta CARLA_FIXED_DELTA)
+        and asynchronous mode (variable delta) with one apply_settings() RPC.
+        A fresh WorldSettings is built instead of get/mutate/apply, which
+        saves the get_settings() round-trip; all other fields keep CARLA's defaults.
+        """
+        world.apply_settings(self.carla.WorldSettings(
+            synchronous_mode    = synchronous,
+            no_rendering_mode   = False,
+            fixed_delta_seconds = CARLA_FIXED_DELTA if synchronous else 0.0,
+        ))
+
+
+    def _cache_world(self, world):
+        """
+        Fetch the per-map data that never changes while the map is loaded
+        (spawn points, spectator), so spawning and the per-tick camera update
+        need no extra lookups.
+        """
+        self._spawn_points      = world.get_map().get_spawn_points()
+        self._spectator         = world.get_spectator()
+        # new spectator actor -> place it on the next tick in any case
+        self._last_cam_key      = None
+
+
     def _load_and_select_blueprints(self, world):
         """
         Fetch all vehicle.* blueprints from the world, store them,
         emit them to populate the UI menu, and auto-select last model if found.
         """
-        bps = [bp.id for bp in world.get_blueprint_library().filter("vehicle.*")]
-        with self._lock:
-            self._blueprints = bps
+        # the only blueprint-library RPC; spawning afterwards works on _bp_by_id alone
+        by_id = {bp.id: bp for bp in world.get_blueprint_library().filter("vehicle.*")}
+        bps = list(by_id)
+        # both are only replaced as a whole -> plain reference stores
+        self._blueprints = bps
+        self._bp_by_id   = by_id
         self.blueprints_loaded.emit(bps)
         self._blueprints_loaded = True
 
         saved_model = self.data.get("model")
         if saved_model in bps:
-            with self._lock:
-                self._vehicle_model = saved_model
+            self._vehicle_model = saved_model
             self.vehicle_model_selected.emit(saved_model)
 
 
@@ -429,12 +974,21 @@ class CarlaConnector(QObject):
         by emitting the camera_position_selected signal.
         """
         saved_cam = self.data.get("camera_selected")
-        if saved_cam in CAMERA_POSITIONS:
-            with self._lock:
-                self._camera_selected = saved_cam
+        idx = _CAMERA_INDEX.get(saved_cam)
+        if idx is not None:
+            self._select_camera(idx)
             self.camera_position_selected.emit(saved_cam)
 
 
+    def _select_camera(self, idx: int):
+        """
+        Store the camera index. It is the only camera state, so a single
+        reference store publishes it atomically (no lock); _apply_camera
+        derives the specialized update function from it.
+        """
+        self._camera_idx = idx
+
+
     def _simulation_loop(self):
         """
         Core loop: while running and connected:
@@ -444,237 +998,278 @@ class CarlaConnector(QObject):
          - control
          - camera
          - sgg
+         - pace to real time (CARLA_FIXED_DELTA)
         """
-        while self._running and self._client:
+        next_tick_ns = time.monotonic_ns()
+        while self._running.is_set() and self._connected.is_set():
             # 0) map change?
             self._process_map_change()
             
-            # 1) Advance the world one synchronous tick
-            snapshot = self._world.tick()
-
-            # 2) Handle any pending spawn command
-            self._process_spawn()
-
-            # 3) Read joystick and control the vehicle
-            self._process_control()
+            # 1) Advance the world one synchronous tick (blocks until the server stepped, returns the frame id)
+            try:
+                # World.tick() has its own timeout argument (default 10 s), client.set_timeout() does not apply
+                frame = self._world.tick(CARLA_TICK_TIMEOUT)
+            except RuntimeError as e:
+                # no answer within CARLA_TICK_TIMEOUT -> report to the GUI and leave the loop
+                self._connected.clear()
+                self.connection_result.emit(False, f"CARLA not responding: {e}")
+                break
+            # state of all actors for exactly this frame (local copy, no RPC per actor)
+            snapshot = self._world.get_snapshot()
+
+            # 2) Handle any pending spawn command (usually none -> skip the call)
+            if self._spawn_pending:
+                self._process_spawn()
 
-            # 4) Update the spectator camera
-            self._apply_camera()
+            # 3) + 4) Control and camera only act on a spawned vehicle
+            if self._spawned_vehicles:
+                # Read joystick and control the vehicle
+                if self._controller_manager is not None:
+                    self._process_control()
+
+                # Update the spectator camera ('free' -> no preset function)
+                if self._camera_idx is not None and _CAMERA_FNS[self._camera_idx] is not None:
+                    self._apply_camera(snapshot)
+
+            # 4b) Send vehicle control + spectator transform in one message.
+            #     apply_batch() does not wait for per-command responses; in synchronous
+            #     mode the commands take effect with the next world.tick() anyway.
+            #     The client is read once: disconnect() may clear it at any time.
+            cmds = self._tick_cmds
+            if cmds:
+                client = self._client
+                if client is not None:
+                    client.apply_batch(cmds)
+                cmds.clear()
 
             # 5) If recording, enqueue a new scene-graph snapshot when interval elapsed
             
             # DEBUG:
             #print(f"[SIM] sgg={bool(self._sgg)}, active={self._recording_active}, folder={self._record_base_folder}")
 
-            if self._sgg and self._recording_active and self._record_base_folder:
-                now = time.time()
-                # Compare current time against the timestamp of the last SGG capture
-                if (now - self._last_sgg_time) >= self._sgg_interval:
-                    # Update the timestamp to throttle next capture
-                    self._last_sgg_time = now
+            if self._recording_ready:
+                self._tick_counter += 1
+                # Every _sgg_every-th simulation tick (integer compare, no clock read)
+                if self._tick_counter >= self._sgg_every:
+                    self._tick_counter = 0
                     # Enqueue the minimal data (frame, ego_id, controls, folder)
                     # for async graph generation in the record worker
-                    self._record_current_frame()
+                    self._record_current_frame(frame)
+
+            # 6) Never step faster than real time: if the server answered early
+            #    (e.g. no rendering), sleep away the rest of the fixed delta
+            next_tick_ns += self._tick_period_ns
+            remaining_ns = next_tick_ns - time.monotonic_ns()
+            if remaining_ns > 0:
+                time.sleep(remaining_ns / 1e9)
+            else:
+                # behind schedule -> restart pacing from now instead of bursting to catch up
+                next_tick_ns = time.monotonic_ns()
 
 
     def _process_spawn(self):
         """
-        If a "spawn" command is in the queue and a model was selected,
-        spawn exactly one vehicle at the next available map spawn point.
+        If spawns were requested and a model was selected, spawn one vehicle
+        per request at the next available map spawn points.
         """
-        try:
-            cmd = self._command_queue.get_nowait()
-        except queue.Empty:
+        # Nothing requested (common case, no lock) or blueprints still loading
+        # in the background -> keep the requests pending
+        if not self._spawn_pending or not self._bp_by_id:
             return
+        # read-and-zero the counter
+        with self._spawn_lock:
+            count, self._spawn_pending = self._spawn_pending, 0
 
-        if cmd == "spawn" and self._vehicle_model:
-            # 1) Get all spawn points for the current map
-            spawn_points = self._world.get_map().get_spawn_points()
-            if not spawn_points:
-                return
+        if not self._vehicle_model:
+            return
+
+        # 1) Cached spawn points of the current map
+        spawn_points = self._spawn_points
+        if not spawn_points:
+            return
 
-            # 2) Choose next spawn index in a round-robin fashion
-            idx = len(self._spawned_vehicles) % len(spawn_points)
-            transform = spawn_points[idx]
+        # 2) Look up the blueprint by stored model ID (cached, no RPC)
+        bp = self._bp_by_id.get(self._vehicle_model)
+        if bp is None:
+            return
 
-            # 3) Find the blueprint by stored model ID
-            bp = self._world.get_blueprint_library().find(self._vehicle_model)
+        vehicles = self._spawned_vehicles
+        for _ in range(count):
+            # 3) Choose next spawn index in a round-robin fashion
+            transform = spawn_points[self._spawn_counter % len(spawn_points)]
 
             # 4) Spawn the actor and record it
             actor = self._world.spawn_actor(bp, transform)
-            self._spawned_vehicles.append(actor)
+            self._spawn_counter += 1
+
+            # 5) Limit reached -> destroy the oldest vehicle before the deque drops its reference
+            if len(vehicles) == vehicles.maxlen:
+                oldest = vehicles.popleft()
+                try:
+                    oldest.destroy()
+                except Exception as e:
+                    self._log_error(f"Fahrzeug {oldest.id} konnte nicht entfernt werden: {e}")
+            vehicles.append(actor)
 
 
     def _process_control(self):
         """
         Poll current joystick mappings from ControllerManager,
         translate throttle/brake/steer/reverse into a VehicleControl,
-        and apply it to the most recently spawned vehicle.
+        and queue it for the most recently spawned vehicle.
         """
         # 0) If no vehicle or controller_manager, skip
-        #if not (self._spawned_vehicles and self._controller_manager):
-        if not (self._spawned_vehicles and hasattr(self, "_controller_manager")):
+        if not (self._spawned_vehicles and self._controller_manager):
             return
 
-        # 1) Fetch mapped control values from the joystick manager
-        current_controls = self._controller_manager.get_mapped_controls()
+        # 1) Fetch mapped control values from the joystick manager into the preallocated array
+        cur  = self._cur_ctrl_vals
+        prev = self._prev_ctrl_vals
+        self._controller_manager.fill_mapped_controls(self._ctrl_names, cur)
 
         # 2) Handle one-shot button actions via rising-edge detection
-        for func, val in current_controls.items():
-            # skip unmapped or None entries
-            if val is None:
-                continue
-
-            # get previous value (0.0 if first frame)
-            prev = self._last_control_values.get(func, 0.0)
-            # rising edge = just pressed (went from <=0.5 to >0.5)
-            pressed = (val > 0.5) and (prev <= 0.5)
+        #    rising edge = just pressed (went from <=0.5 to >0.5), evaluated for all controls at once
+        pressed = (cur > 0.5) & (prev <= 0.5)
+        for i in np.flatnonzero(pressed):
+            func = self._ctrl_names[i]
 
             # Camera “next” button pressed?
-            if func == "cam_switch" and pressed:
-                # cycle forward through CAMERA_POSITIONS keys
-                keys = list(CAMERA_POSITIONS.keys())
-                try:
-                    idx = keys.index(self._camera_selected)
-                except (AttributeError, ValueError):
-                    idx = 0
-                new_cam = keys[(idx + 1) % len(keys)]
+            if func == "cam_switch":
+                # cycle forward through the camera keys by index
+                new_idx = ((self._camera_idx or 0) + 1) % len(_CAMERA_KEYS)
+                new_cam = _CAMERA_KEYS[new_idx]
                 # persist, update internal state, and emit so UI updates
-                self.data.set("camera_selected", new_cam)
-                self._camera_selected = new_cam
-                self.camera_position_selected.emit(new_cam)
+                self._persist("camera_selected", new_cam)
+                self._select_camera(new_idx)
+                if self._has_camera_listener:
+                    self.camera_position_selected.emit(new_cam)
             
             # Respawn button pressed?
-            if func == "respawn" and pressed:
-                self._command_queue.put("spawn")
+            elif func == "respawn":
+                self._request_spawn()
                 self._process_spawn()
                 print("respawning")
 
             # Record toggle pressed?
-            if func == "record" and pressed:
+            elif func == "record":
                 # if already recording, stop; otherwise start
-                if self._recording_active:
+                if self._recording_active.is_set():
                     self.stop_recording()
                 else:
                     self.start_recording()
 
-            # remember theses values for next tick’s edge detection
-            self._last_control_values[func] = val
+        # remember theses values for next tick’s edge detection
+        np.copyto(prev, cur)
 
-            # 3) Now handle continuous driving inputs
-            throttle = current_controls.get("throttle", 0.0)
-            brake    = current_controls.get("brake",    0.0)
-            steer    = current_controls.get("steering", 0.0)
-            reverse  = (current_controls.get("reverse", 0.0) > 0.5)
+        # 3) Now handle continuous driving inputs (once per tick, one gather from the array)
+        throttle, brake, steer, reverse = cur.take(self._drive_idx).tolist()
+        reverse = reverse > 0.5
 
-            # 4) If reverse is engaged do nothing, works like this maybe needed if u want to bind brake and drive back on same axis... 
-            #if reverse:
-                #throttle = brake
-                #brake    = 0.0
+        # 4) If reverse is engaged do nothing, works like this maybe needed if u want to bind brake and drive back on same axis... 
+        #if reverse:
+            #throttle = brake
+            #brake    = 0.0
 
-            # 5) Build and send the VehicleControl to the last spawned actor
-            control = self.carla.VehicleControl(
-                throttle = throttle,
-                brake    = brake,
-                steer    = steer,
-                reverse  = reverse,
-            )
+        # 5) Fill the reusable VehicleControl (allocated once on connect)
+        control = self._vehicle_control
+        control.throttle = throttle
+        control.brake    = brake
+        control.steer    = steer
+        control.reverse  = reverse
 
-            # 6) Apply to the last spawned actor
-            vehicle = self._spawned_vehicles[-1]
-            vehicle.apply_control(control)
+        # 6) Queue it for the last spawned actor (sent in the per-tick batch)
+        vehicle = self._spawned_vehicles[-1]
+        self._tick_cmds.append(self._cmd.ApplyVehicleControl(vehicle.id, control))
 
 
-    def _apply_camera(self):
+    def _apply_camera(self, snapshot):
         """
-        Position the spectator camera relative to the last spawned vehicle
-        using offsets defined in CAMERA_POSITIONS.
+        Queue the spectator transform relative to the last spawned vehicle
+        using offsets defined in CAMERA_POSITIONS (sent in the per-tick batch).
         """
         # 1) Only proceed if connected and at least one vehicle exists
         if not self._client or not self._spawned_vehicles:
             return
 
-        # 2) Lookup the configuration for the current camera key (z.B. "bird", "cockpit", "free")
-        cam_key = self._camera_selected
-        cfg = CAMERA_POSITIONS.get(cam_key)
-        # 'free' mode or invalid key
-        if not cfg:
+        # 2) Specialized update function for the current camera key (z.B. "bird", "cockpit"),
+        #    built once at import (_CAMERA_FNS); None = 'free' mode
+        idx       = self._camera_idx
+        spectator = self._spectator
+        if idx is None or spectator is None:
+            return
+        apply_fn = _CAMERA_FNS[idx]
+        if apply_fn is None:
             return
 
-        # 3) Get the vehicle’s current transform (position + rotation)
-        actor = self._spawned_vehicles[-1]
-        actor_tf = actor.get_transform()
-
-        # 4) Extract local offset from the settings dict
-        loc = cfg["transform"]["location"]
-        rot = cfg["transform"]["rotation"]
-
-        # 5) Compute world-space offset vectors along vehicle axes
-        forward = actor_tf.get_forward_vector()
-        right   = actor_tf.get_right_vector()
-        up      = actor_tf.get_up_vector()
-
-        world_offset = self.carla.Location(
-            x = forward.x * loc["x"] + right.x * loc["y"] + up.x * loc["z"],
-            y = forward.y * loc["x"] + right.y * loc["y"] + up.y * loc["z"],
-            z = forward.z * loc["x"] + right.z * loc["y"] + up.z * loc["z"],
-        )
-
-        # 6) Add offset to vehicle position for camera location
-        new_location = actor_tf.location + world_offset
-
-        # 7) Compute camera rotation by adding local rotation offsets
-        base_rot = actor_tf.rotation
-        new_rotation = self.carla.Rotation(
-            pitch = base_rot.pitch + rot["pitch"],
-            yaw   = base_rot.yaw   + rot["yaw"],
-            roll  = base_rot.roll  + rot["roll"],
+        # 3) Place the cached spectator relative to the last spawned vehicle,
+        #    using its transform from the world snapshot of this tick
+        actor_id   = self._spawned_vehicles[-1].id
+        actor_snap = snapshot.find(actor_id)
+        if actor_snap is None:
+            # spawned during this tick -> not part of the snapshot yet
+            return
+        actor_tf = actor_snap.get_transform()
+
+        # 4) Skip if camera, vehicle and its pose (1 cm / 0.1°) are the same as last tick
+        loc, rot = actor_tf.location, actor_tf.rotation
+        key = (
+            idx, actor_id,
+            round(loc.x, 2), round(loc.y, 2), round(loc.z, 2),
+            round(rot.pitch, 1), round(rot.yaw, 1), round(rot.roll, 1),
         )
+        if key == self._last_cam_key:
+            return
+        self._last_cam_key = key
 
-        # 8) Apply the new transform to the spectator camera
-        new_transform = self.carla.Transform(new_location, new_rotation)
-        spectator = self._world.get_spectator()
-        spectator.set_transform(new_transform)
+        # ApplyTransform copies the value, so the scratch transform can be reused next tick
+        transform = apply_fn(actor_tf, self._scratch_tf)
+        self._tick_cmds.append(self._cmd.ApplyTransform(spectator.id, transform))
 
 
-    def _record_current_frame(self):
+    def _record_current_frame(self, frame: int):
         """
         Package up minimal data needed to record the current frame:
-        (frame index, ego actor id, control state, destination folder)
+        (CARLA frame id from world.tick(), ego actor id, control state, destination folder)
         and enqueue it for the recording worker.
+        Every frame is pushed on its own: the SGG reads the live world, so a frame
+        has to be generated right after its tick, not collected with later ones.
         """
         # Debug:
         #print(f"[RCF] spawned={len(self._spawned_vehicles)}, recording_active={self._recording_active}")
 
         if not self._spawned_vehicles:
-            print("Kein Fahrzeugs-Actor vorhanden –> Recording übersprungen.")
+            self._log_error("Kein Fahrzeugs-Actor vorhanden –> Recording übersprungen.")
             return
 
         latest_spawned_vehicle = self._spawned_vehicles[-1]
-        frame = self._sgg.timestep                  # current SGG frame count
         ego_id = latest_spawned_vehicle.id
         ctrl = latest_spawned_vehicle.get_control() # CARLA VehicleControl state
-        control_copy = {
-            "throttle":        ctrl.throttle,
-            "steer":           ctrl.steer,
-            "brake":           ctrl.brake,
-            "hand_brake":      ctrl.hand_brake,
-            "reverse":         ctrl.reverse,
-            "manual_gear_shift": ctrl.manual_gear_shift,
-            "gear":            ctrl.gear
-        }
+
+        # Reuse a pooled dict (only allocate if the worker still holds all of them)
+        try:
+            control_copy = self._ctrl_pool.pop()
+        except IndexError:
+            control_copy = dict.fromkeys(_CONTROL_FIELDS)
+        for field in _CONTROL_FIELDS:
+            control_copy[field] = getattr(ctrl, field)
        
-        # Enqueue the tuple for the background recorder
+        # Hand the tuple to the background recorder (single producer: this thread)
         # Debug:
         # print(f"[RCF] putting frame={frame}, ego={ego_id}")
-
-        self._record_queue.put((frame, ego_id, control_copy, self._record_base_folder))
+        if not self._record_queue.push((frame, ego_id, control_copy, self._record_base_folder)):
+            # Worker is more than RECORD_BUFFER_SECONDS behind -> drop this frame
+            # (the sim loop never blocks on the worker)
+            self._ctrl_pool.append(control_copy)
+            self._record_dropped += 1
+            self._log_error("Record buffer full –> Frame übersprungen.")
+        # wake the record worker
+        self._record_event.set()
 
 
     @pyqtSlot(str)
     def set_map(self, map_id: str):
         # speichert auch im DataManager, falls gewünscht
-        self.data.set("map_selected", map_id)
+        self._persist("map_selected", map_id)
         self._map_queue.put(map_id)
         self.map_changed.emit(map_id)
 
@@ -685,25 +1280,29 @@ class CarlaConnector(QObject):
         except queue.Empty:
             return
 
-        # 1) Map laden
-        world = self._client.load_world(map_id)
-        # 2) Sync‐Settings neu setzen
-        settings = world.get_settings()
-        settings.synchronous_mode    = True
-        settings.fixed_delta_seconds = 0.01
-        world.apply_settings(settings)
-        tm = self._client.get_trafficmanager()
-        tm.set_synchronous_mode(True)
-
-        # 3) Alte Fahrzeuge entfernen
-        for actor in self._spawned_vehicles:
-            try: actor.destroy()
-            except: pass
-        self._spawned_vehicles.clear()
-
-        # 4) Neue Welt merken und Kamerapreset/Blueprints erneut anwenden
-        with self._lock:
+        # 1) Map laden (can take much longer than a tick -> connect timeout meanwhile)
+        client = self._client
+        self._begin_slow_rpcs(client)
+        try:
+            world = client.load_world(map_id)
+            # 2) Sync‐Settings neu setzen
+            self._apply_world_settings(world, synchronous=True)
+            tm = client.get_trafficmanager()
+            tm.set_synchronous_mode(True)
+
+            # 3) Alte Fahrzeuge entfernen
+            for actor in self._spawned_vehicles:
+                try: actor.destroy()
+                except: pass
+            self._spawned_vehicles.clear()
+            self._spawn_counter = 0
+
+            # 4) Neue Welt merken (single reference store, no lock) und Kamerapreset/Blueprints erneut anwenden
             self._world = world
-        self._load_and_select_blueprints(world)
-        self._auto_select_camera(world)
+            self._cache_world(world)
+            self._load_and_select_blueprints(world)
+            self._auto_select_camera(world)
+        finally:
+            # 5) Back to the short per-tick timeout (unless the preload still needs the long one)
+            self._end_slow_rpcs(client)
 
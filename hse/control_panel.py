@@ -1,16 +1,15 @@
 # hse/control_panel.py 
 
-import sys
+import threading
 import time
-import subprocess
-import psutil
+from collections import deque
 from pathlib import Path
-import datetime
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional
 import platform
+from contextlib import contextmanager
 
-from PyQt5.QtCore import QObject, QEvent, QTimer, QThread, pyqtSignal, pyqtSlot
-from PyQt5.QtWidgets import QMainWindow, QComboBox, QMessageBox, QAction
+from PyQt5.QtCore import Qt, QObject, QEvent, QEventLoop, QRunnable, QThreadPool, QTimer, QThread, pyqtSignal, pyqtSlot
+from PyQt5.QtWidgets import QApplication, QMainWindow, QComboBox, QMessageBox, QAction
 
 from hse.ui_builder import build_ui
 from hse.data_manager import DataManager
@@ -18,14 +17,55 @@ from hse.utils.settings import CARLA_DIR, SGG_DIR, DEFAULT_VALUES
 from hse.controller_manager import ControllerManager
 from hse.utils.joystick_visualizer import JoystickVisualizer
 from hse.carla_connector import CarlaConnector
-from hse.utils.settings import CAMERA_POSITIONS
+from hse.utils.settings import (
+    CAMERA_POSITIONS, INPUT_POLL_INTERVAL_MS, PANEL_SAVE_DELAY_MS, SHUTDOWN_TIMEOUT,
+    SGG_PULL_CLOSE_TIMEOUT, SGG_PULL_KILL_TIMEOUT
+)
+
+
+# States of the status labels, colored by ui_builder.STATUS_QSS (green / orange / red, bold)
+_STATE_OK    = "ok"
+_STATE_BUSY  = "busy"
+_STATE_ERROR = "error"
+
+
+# File browser command of this platform (fixed for the process lifetime):
+# Explorer on Windows, open on macOS, xdg-open for most Linux distributions
+_OPENER = {"Windows": ["explorer"], "Darwin": ["open"]}.get(platform.system(), ["xdg-open"])
+
+
+def _set_state(widget, state: str) -> None:
+    """
+    Switch a status label to another state of the window stylesheet.
+    Only re-polishes the widget (no stylesheet parsing), and only on a change.
+    """
+    if widget.property("state") != state:
+        widget.setProperty("state", state)
+        style = widget.style()
+        style.unpolish(widget)
+        style.polish(widget)
 
 
 class ControlPanel(QMainWindow):
+    # Asks the persist worker (on its own thread) to write state.json
+    request_flush = pyqtSignal()
+
     def __init__(self, controller_manager: ControllerManager, connector: CarlaConnector):
         super().__init__()
         # Initialize the data manager for storing configuration = state of application
         self.data = DataManager()
+        # Field edits update self.data at once; the file write runs on a worker thread,
+        # debounced by a single-shot timer so quick edits end up in one write
+        self._persist_thread = QThread(self)
+        self._persist_worker = _PersistWorker(self.data)
+        self._persist_worker.moveToThread(self._persist_thread)
+        self.request_flush.connect(self._persist_worker.flush)
+        self._persist_thread.start()
+        self._persist_pending = False
+        self._persist_timer = QTimer(self)
+        self._persist_timer.setSingleShot(True)
+        self._persist_timer.setInterval(PANEL_SAVE_DELAY_MS)
+        self._persist_timer.timeout.connect(self._request_persist_flush)
         # Keep a reference to the external controller manager                   
         self.cm = controller_manager  
         # Keep a reference to the external Carla connector               
@@ -39,10 +79,20 @@ class ControlPanel(QMainWindow):
         # Build the UI components and store references
         self.refs = build_ui(self)
         self._init_values_from_data()
+        self._init_input_labels()
         # Set up signal-slot connections for UI interactions              
         self._init_connections()
         
         self._official_maps = []
+        # Set once closeEvent runs (no error dialogs, no second shutdown)
+        self._closing = False
+        # QActions per menu, keyed by their item (camera key, blueprint ID, map name),
+        # kept by _fill_menu across repopulations
+        self._menu_actions: Dict[Any, Dict[str, QAction]] = {}
+
+        # Background git clone/pull of the SGG repo (None = not running)
+        self._sgg_thread = None
+        self._sgg_worker = None
         
 
         # Disable the spawn button until a successful connection and model selection
@@ -65,13 +115,18 @@ class ControlPanel(QMainWindow):
         # Connect the "controls" menu action to opening the joystick-visualizer-window
         self.refs["action_controls"].triggered.connect(self._open_control_manager)
 
-        # Start a background thread that polls joystick input every 0.1 seconds
-        self._input_thread = QThread(self)
-        self._input_worker = InputWorker(self.cm)
-        self._input_worker.moveToThread(self._input_thread)
-        self._input_thread.started.connect(self._input_worker.run)
-        self._input_worker.update_signal.connect(self._update_input_fields)
-        self._input_thread.start()
+        # Device name is cached by the ControllerManager, the label is only set per device swap
+        self.refs["input_device"].setText(self.cm.current_joystick_name)
+        self.cm.device_changed.connect(self._on_device_changed)
+
+        # Poll joystick input every 0.1 seconds with a timer on the GUI thread
+        # (reading the mapped controls is cheap, the labels live here anyway)
+        # ControllerManager.state_version of the last shown values (skip polls without new input)
+        self._input_version = None
+        self._input_timer = QTimer(self)
+        self._input_timer.setInterval(INPUT_POLL_INTERVAL_MS)
+        self._input_timer.timeout.connect(self._poll_inputs)
+        self._input_timer.start()
 
         # Populate camera selection menu with data from settings
         self._populate_camera_menu()
@@ -96,6 +151,7 @@ class ControlPanel(QMainWindow):
         self.refs["label_framecount"].setText(str(count))
 
 
+    @pyqtSlot()
     def _open_control_manager(self):
         """Bring the existing joystick window to front, or create and show it"""
         if hasattr(self, "_control_win") and self._control_win.isVisible():
@@ -112,15 +168,59 @@ class ControlPanel(QMainWindow):
         self._official_maps = maps
         self._populate_map_menu()
 
+    def _fill_menu(self, menu, items, on_selected):
+        """
+        Show one QAction per item in `menu`, in a single batch:
+        updates and signals of the menu are paused while it is refilled,
+        so there is one layout/paint pass instead of one per action.
+        Every action carries its item in QAction.data() and is connected to the
+        same bound slot `on_selected` (no closure per action).
+        Actions are memoized per menu and item: only actions for new items are
+        created (and connected), actions for items that disappeared are removed,
+        all others are kept as they are. The menu order follows `items`.
+        """
+        items = list(items)
+        actions = self._menu_actions.setdefault(menu, {})
+        menu.setUpdatesEnabled(False)
+        menu.blockSignals(True)
+        try:
+            # 1) Remove actions whose item is gone
+            wanted = set(items)
+            for item in [item for item in actions if item not in wanted]:
+                act = actions.pop(item)
+                menu.removeAction(act)
+                act.deleteLater()
+
+            # 2) Create actions for new items only
+            for item in items:
+                if item not in actions:
+                    act = QAction(item, self)
+                    act.setData(item)
+                    act.triggered.connect(on_selected)
+                    menu.addAction(act)
+                    actions[item] = act
+
+            # 3) Order changed (new items in between) -> re-add in the wanted order
+            #    (addAction moves an action the menu already has)
+            if list(actions) != items:
+                for item in items:
+                    menu.addAction(actions[item])
+                self._menu_actions[menu] = {item: actions[item] for item in items}
+        finally:
+            menu.blockSignals(False)
+            menu.setUpdatesEnabled(True)
+            menu.update()
+
+
     def _populate_camera_menu(self):
-        """Clear existing camera menu and add actions for each predefined camera position"""
-        menu = self.refs["menu_camera"]
-        menu.clear()
-        for cam in CAMERA_POSITIONS.keys():
-            act = QAction(cam, self)
-            # When selected, instruct the connector to switch camera
-            act.triggered.connect(lambda _, c=cam: self.connector.set_camera_position(c))
-            menu.addAction(act)
+        """Show an action for each predefined camera position in the camera menu"""
+        self._fill_menu(self.refs["menu_camera"], CAMERA_POSITIONS.keys(), self._on_camera_action)
+
+
+    @pyqtSlot()
+    def _on_camera_action(self):
+        """When selected, instruct the connector to switch camera (key in QAction.data())"""
+        self.connector.set_camera_position(self.sender().data())
 
 
     @pyqtSlot(str)
@@ -130,43 +230,137 @@ class ControlPanel(QMainWindow):
 
 
     def closeEvent(self, event):
-        """Stop the input polling worker and clean up the thread on window close."""
+        """Stop input polling and all background workers on window close."""
+        # a second close request while we are still shutting down is ignored
+        if self._closing:
+            event.ignore()
+            return
+        self._closing = True
         print("close event, Control Panel says Goodbye!")
+        # no more polls once pygame is shut down
+        self._input_timer.stop()
+
+        # Connector and controller are torn down on a pool thread while _wait_painting keeps
+        # the window painting (bounded by SHUTDOWN_TIMEOUT). User input is not processed,
+        # so no click (Connect, Start Recording, menus) reaches the connector meanwhile.
+        # Both run in ONE task and in this order: the simulation loop reads the controller
+        # until the connector is down.
+        done = threading.Event()
+        self._shutdown_task = _Task(self._shutdown_backends, done)
+        QThreadPool.globalInstance().start(self._shutdown_task)
+        if self._wait_painting(done.is_set, SHUTDOWN_TIMEOUT):
+            # back on the GUI thread: stop the connector's timers and print its last messages
+            self.connector.stop_reporting()
+        else:
+            # the task is still inside connector.shutdown()/pygame.quit(): leave the
+            # connector alone (stop_reporting would race with it), the app exits anyway
+            print(f"⚠️ Connector/controller still shutting down after {SHUTDOWN_TIMEOUT:.1f}s, "
+                  "exiting without waiting (last connector messages not printed).")
+
+        # Let a running SGG clone/pull finish, so the repo is not left half written,
+        # but never wait unbounded (git may hang on the network) and keep painting meanwhile
+        thread, worker = self._sgg_thread, self._sgg_worker
+        if thread is not None:
+            # _on_sgg_thread_finished (delivered by the wait loop) clears _sgg_thread
+            pull_done = lambda: self._sgg_thread is None or thread.isFinished()
+            if not self._wait_painting(pull_done, SGG_PULL_CLOSE_TIMEOUT):
+                # kill git, which ends the worker's read loop, and give the thread one more chance
+                worker.abort()
+                if not self._wait_painting(pull_done, SGG_PULL_KILL_TIMEOUT):
+                    print("⚠️ SGG pull did not stop, terminating its thread (repo may be incomplete).")
+                    thread.terminate()
+                    thread.wait(int(SGG_PULL_KILL_TIMEOUT * 1000))
+
+        # Stop the persist worker and write a still pending change right here
+        self._persist_timer.stop()
+        self._persist_thread.quit()
+        self._persist_thread.wait()
+        if self._persist_pending:
+            self.data.save()
+
+        super().closeEvent(event)
+       
+
+    def _wait_painting(self, is_done, timeout: float) -> bool:
+        """
+        Used while closing: keep the window painting (user input is not processed)
+        until is_done() returns True or `timeout` seconds have passed.
+        Returns whether is_done() became True.
+        """
+        deadline = time.monotonic() + timeout
+        while not is_done():
+            if time.monotonic() >= deadline:
+                return False
+            QApplication.processEvents(QEventLoop.ExcludeUserInputEvents, 50)
+            time.sleep(0.01)
+        return True
+
+
+    def _shutdown_backends(self):
+        """Runs on a pool thread during closeEvent."""
         self.connector.shutdown()
         self.cm.shutdown() 
 
-        self._input_worker.stop()
-        self._input_thread.quit()
-        self._input_thread.wait()
 
-        super().closeEvent(event)
-       
+    @pyqtSlot()
+    def _poll_inputs(self):
+        """
+        Timer slot: read the mapped controls into the preallocated value list
+        (same order as the labels, no dict per poll) and show them.
+        Does nothing while the controller reported no new input.
+        """
+        version = self.cm.state_version
+        if version == self._input_version:
+            return
+        self._input_version = version
+
+        current = self._input_values
+        self.cm.fill_mapped_controls(self._input_funcs, current)
+        self._update_input_fields(current)
+
 
-    @pyqtSlot(dict, str)
-    def _update_input_fields(self, current: Dict[str, Any], device_name: str):
+    @pyqtSlot(str)
+    def _on_device_changed(self, name: str):
+        """Show the name of the newly selected joystick device (once per swap)"""
+        self.refs["input_device"].setText(name)
+
+
+    def _update_input_fields(self, current: List[float]):
         """
-        Display the name of the current joystick device
+        Display the value of each control (`current` is in the order of _input_funcs,
+        unmapped controls are 0.0). Labels are only touched
+        when their text actually changed (colors are set once in _init_input_labels).
         """
-        # 1. Joystick‐Name
-        self.refs["input_device"].setText(device_name)
+        # Update each control value label with formatted text
+        # (label lookups resolved once in _init_input_labels; buttons are 0/1)
+        last_text = self._last_input_text
+        for i, lbl in enumerate(self._input_labels):
+            text = f"{current[i]:.2f}"
+            if last_text[i] != text:
+                lbl.setText(text)
+                last_text[i] = text
 
-        # Update each control value label with formatted text and color
-        for func in DEFAULT_VALUES["controls"]:
-            lbl = self.refs.get(f"input_{func}")
-            if not lbl:
-                continue
-
-            val = current.get(func)
-            if isinstance(val, bool):
-                text = "1.00" if val else "0.00"
-            elif isinstance(val, (int, float)):
-                text = f"{val:.2f}"
-            else:
-                text = "0.00"
 
-            color = DEFAULT_VALUES["controls"][func]["color"]
-            lbl.setText(text)
-            lbl.setStyleSheet(f"color: {color}; font-weight: bold;")
+    def _init_input_labels(self):
+        """
+        Give every control value label its color once (a stylesheet is re-parsed
+        on every setStyleSheet call), resolve the labels used by
+        _update_input_fields and reset the last shown texts.
+        Functions, labels, values and last texts are parallel sequences (same index).
+        """
+        funcs, labels = [], []
+        for func, cfg in DEFAULT_VALUES["controls"].items():
+            lbl = self.refs.get(f"input_{func}")
+            if lbl:
+                lbl.setStyleSheet(f"color: {cfg['color']}; font-weight: bold;")
+                funcs.append(func)
+                labels.append(lbl)
+        self._input_funcs  = tuple(funcs)
+        self._input_labels = tuple(labels)
+        # filled in place by ControllerManager.fill_mapped_controls on every poll
+        self._input_values: List[float] = [0.0] * len(funcs)
+        # last text per label, so unchanged values are not set again
+        self._last_input_text: List[Optional[str]] = [None] * len(funcs)
 
 
     def _init_values_from_data(self):
@@ -187,27 +381,25 @@ class ControlPanel(QMainWindow):
                 dropdown.setCurrentIndex(index)
 
         # Whenever the user picks a different version, save it back to DataManager.
-        dropdown.currentTextChanged.connect(lambda v: self.data.set("carla_version", v))
+        dropdown.currentTextChanged.connect(lambda v: self._persist("carla_version", v))
 
         # Show whether the Scene Graph Generator (SGG) is loaded/ pulled or missing.
         loaded = self.data.get("sgg_loaded")
         if loaded:
             self.refs["label_sgg_status"].setText("🟢 SGG ready")
-            self.refs["label_sgg_status"].setStyleSheet("color: green; font-weight: bold;")
+            _set_state(self.refs["label_sgg_status"], _STATE_OK)
         else:
             self.refs["label_sgg_status"].setText("🔴 SGG fehlt")
-            self.refs["label_sgg_status"].setStyleSheet("color: red; font-weight: bold;")
+            _set_state(self.refs["label_sgg_status"], _STATE_ERROR)
 
 
     def _init_connections(self):
-        # Install event filters on the IP and port QLineEdits to detect focus loss.
-        ip_filter = FocusEventFilter(self._save_field_on_focus_lost)
-        port_filter = FocusEventFilter(self._save_field_on_focus_lost)
-        self.refs["input_ip"].installEventFilter(ip_filter)
-        self.refs["input_port"].installEventFilter(port_filter)
-
-        # Keep references to the filters so they aren’t garbage-collected.
-        self._focus_filters = [ip_filter, port_filter]
+        # Install one shared event filter on the IP and port QLineEdits to detect focus loss.
+        # Keep a reference to the filter so it isn’t garbage-collected.
+        self._focus_filter = FocusEventFilter({
+            self.refs["input_ip"]:   self._save_field_on_focus_lost,
+            self.refs["input_port"]: self._save_field_on_focus_lost,
+        })
 
         # Connect the "Open Folder" button to its handler.
         self.refs["open_folder_button"].clicked.connect(self._on_open_carla_folder)
@@ -226,25 +418,43 @@ class ControlPanel(QMainWindow):
         """
         if field == self.refs["input_ip"]:
             new_ip = field.text()
-            self.data.set("host", new_ip)
+            self._persist("host", new_ip)
             print(f"💾 New host saved: {new_ip}")
         # If it's the port field, try converting to int and save; ignore invalid entries.    
         elif field == self.refs["input_port"]:
             try:
                 port = int(field.text())
-                self.data.set("port", port)
+                self._persist("port", port)
                 print(f"💾 New port saved: {port}")
             except ValueError:
                 print("⚠️ Invalid port value – not saved.")
 
 
+    def _persist(self, key: str, value: Any):
+        """
+        Update a setting in the DataManager immediately (readers see it at once)
+        and (re)start the debounce timer for the file write.
+        """
+        self.data.set(key, value, save=False)
+        self._persist_pending = True
+        self._persist_timer.start()
+
+
+    @pyqtSlot()
+    def _request_persist_flush(self):
+        """Debounce time is over -> let the persist worker write state.json."""
+        self._persist_pending = False
+        self.request_flush.emit()
+
+
+    @pyqtSlot()
     def _on_connect(self):
         """
         Called when the user clicks "Connect".
         Immediately update the status label to show “connecting…”.
         """
         self.refs["label_status"].setText("🔄 Connecting...")
-        self.refs["label_status"].setStyleSheet("color: orange; font-weight: bold;")
+        _set_state(self.refs["label_status"], _STATE_BUSY)
 
         # Delegate the actual connection logic to the connector.
         self.connector.connect()
@@ -255,27 +465,48 @@ class ControlPanel(QMainWindow):
         """
         Slot that receives the outcome of connector.connect()
         """
+        refs = self.refs
         if success:
-            # Mark as connected and update UI to green “Connected”.
+            # Mark as connected and update UI to green “Connected” (one repaint for all widgets).
             self._connected = True
-            self.refs["label_status"].setText("🟢 Connected")
-            self.refs["label_status"].setStyleSheet("color: green; font-weight: bold;")
-
-            # Display the CARLA version in the UI.
-            version = self.data.get("carla_version")
-            self.refs["label_version"].setText(version)
-
-            # Ensure the camera label is initialized (in case connector didn't emit it yet).
-            cam = self.data.get("camera_selected", "free")
-            self.refs["label_camera"].setText(cam)
-            
-            # Enable the spawn button if a vehicle model is already selected.
-            if self.data.get("model"):
-                self.refs["spawn_button"].setEnabled(True)            
+            with self._batched_ui(refs["label_status"], refs["label_version"],
+                                  refs["label_camera"], refs["spawn_button"]):
+                refs["label_status"].setText("🟢 Connected")
+                _set_state(refs["label_status"], _STATE_OK)
+
+                # Display the CARLA version in the UI.
+                version = self.data.get("carla_version")
+                refs["label_version"].setText(version)
+
+                # Ensure the camera label is initialized (in case connector didn't emit it yet).
+                cam = self.data.get("camera_selected", "free")
+                refs["label_camera"].setText(cam)
+                
+                # Enable the spawn button if a vehicle model is already selected.
+                if self.data.get("model"):
+                    refs["spawn_button"].setEnabled(True)            
         else:
-            self.refs["label_status"].setText("🔴 Disconnected")
-            self.refs["label_status"].setStyleSheet("color: red; font-weight: bold;")
-            QMessageBox.critical(self, "Verbindungsfehler", message)
+            with self._batched_ui(refs["label_status"]):
+                refs["label_status"].setText("🔴 Disconnected")
+                _set_state(refs["label_status"], _STATE_ERROR)
+            # modal dialog only after the label is repainted (not while the window closes)
+            if not self._closing:
+                QMessageBox.critical(self, "Verbindungsfehler", message)
+
+
+    @contextmanager
+    def _batched_ui(self, *widgets):
+        """
+        Pause painting of `widgets` while several of their properties change,
+        so they are repainted once at the end instead of after every setter.
+        """
+        for w in widgets:
+            w.setUpdatesEnabled(False)
+        try:
+            yield
+        finally:
+            for w in widgets:
+                w.setUpdatesEnabled(True)
 
 
     @pyqtSlot(str)
@@ -294,6 +525,7 @@ class ControlPanel(QMainWindow):
         self.connector.spawn_vehicle()
 
 
+    @pyqtSlot()
     def _on_open_carla_folder(self):
         """Open the WindowsNoEditor folder for the selected CARLA version."""
         version = self.refs["carla_version"].currentText()
@@ -314,78 +546,94 @@ class ControlPanel(QMainWindow):
         Open a folder in the native file browser, depending on the current platform.
         Supports Windows, macOS (Darwin) and Linux.
         """
-        system = platform.system()
-        print(system)
-        if system == "Windows":
-            # On Windows use Explorer
-            subprocess.Popen(["explorer", str(path)])
-        elif system == "Darwin":
-            # On macOS use open
-            subprocess.Popen(["open", str(path)])
-        else:
-            # Fallback for most Linux distributions
-            subprocess.Popen(["xdg-open", str(path)])
+        import subprocess   # only needed on click, keeps it off the startup path
+        subprocess.Popen(_OPENER + [str(path)], close_fds=True)
 
 
+    @pyqtSlot()
     def _on_pull_sgg(self):
-        """Clone or update the Carla Scene Graph repository."""
-        GIT_URL = "https://github.com/less-lab-uva/carla_scene_graphs.git"
-        try:
-            if not SGG_DIR.exists():
-                print("📦 Cloning SGG repository...")
-                result = subprocess.run(
-                    ["git", "clone", GIT_URL],
-                    cwd=CARLA_DIR.parent,
-                    stdout=subprocess.PIPE,
-                    stderr=subprocess.PIPE,
-                    text=True
-                )
-                if result.returncode != 0:
-                    raise RuntimeError(result.stderr)
-            else:
-                print("🔄 Pulling latest SGG changes...")
-                result = subprocess.run(
-                    ["git", "pull"],
-                    cwd=SGG_DIR,
-                    stdout=subprocess.PIPE,
-                    stderr=subprocess.PIPE,
-                    text=True
-                )
-                if result.returncode != 0:
-                    raise RuntimeError(result.stderr)
-            
+        """
+        Clone or update the Carla Scene Graph repository.
+        git runs in a SggPullWorker on its own QThread, so the GUI stays responsive;
+        the menu action is disabled until the thread is gone (_on_sgg_thread_finished).
+        """
+        if self._sgg_thread is not None:
+            return
+        self.refs["action_pull_sgg"].setEnabled(False)
+        self.refs["label_sgg_status"].setText("🔄 Loading SGG...")
+        _set_state(self.refs["label_sgg_status"], _STATE_BUSY)
+
+        # parented -> owned by Qt, so dropping our reference never destroys a running thread
+        self._sgg_thread = QThread(self)
+        self._sgg_worker = SggPullWorker()
+        self._sgg_worker.moveToThread(self._sgg_thread)
+        self._sgg_thread.started.connect(self._sgg_worker.run)
+        self._sgg_worker.progress.connect(self._on_sgg_pull_progress)
+        # quit() directly on the worker thread: the QThread object lives in the GUI thread,
+        # a queued quit would only run after the GUI slots
+        self._sgg_worker.finished.connect(self._sgg_thread.quit, Qt.DirectConnection)
+        self._sgg_worker.finished.connect(self._on_sgg_pull_finished)
+        # cleanup once the thread's event loop has really ended
+        self._sgg_thread.finished.connect(self._sgg_worker.deleteLater)
+        self._sgg_thread.finished.connect(self._sgg_thread.deleteLater)
+        self._sgg_thread.finished.connect(self._on_sgg_thread_finished)
+        self._sgg_thread.start()
+
+
+    @pyqtSlot(str)
+    def _on_sgg_pull_progress(self, line: str):
+        """Show git's latest progress line (shortened) in the SGG status label."""
+        if len(line) > 40:
+            line = line[:39] + "…"
+        self.refs["label_sgg_status"].setText(f"🔄 {line}")
+
+
+    @pyqtSlot(bool, str)
+    def _on_sgg_pull_finished(self, success: bool, message: str):
+        """Back on the GUI thread: store the result and update the status label."""
+        if success:
             # Upon success, mark SGG as loaded and update the status label.
             print("✅ SGG loaded successfully.")
             self.data.set("sgg_loaded", True)
             self.refs["label_sgg_status"].setText("🟢 SGG ready")
-            self.refs["label_sgg_status"].setStyleSheet("color: green; font-weight: bold;")
-        except Exception as e:
-            print("❌ Error loading SGG:", e)
+            _set_state(self.refs["label_sgg_status"], _STATE_OK)
+        else:
+            print("❌ Error loading SGG:", message)
             self.refs["label_sgg_status"].setText("🔴 Load error")
-            self.refs["label_sgg_status"].setStyleSheet("color: red; font-weight: bold;")
+            _set_state(self.refs["label_sgg_status"], _STATE_ERROR)
             self.data.set("sgg_loaded", False)
 
 
+    @pyqtSlot()
+    def _on_sgg_thread_finished(self):
+        """The pull thread has ended: drop the references (deleteLater frees both) and allow the next pull."""
+        self._sgg_thread = None
+        self._sgg_worker = None
+        self.refs["action_pull_sgg"].setEnabled(True)
+
+
+    @pyqtSlot(list)
     def _populate_vehicle_menu(self, blueprints: list):
         """Fill the "Vehicle" submenu with QAction items for each blueprint ID."""
-        menu = self.refs["menu_vehicle"]
-        menu.clear()
-        for bp_id in blueprints:
-            action = QAction(bp_id, self)
-            # When selected, instruct the connector to use this vehicle model.
-            action.triggered.connect(lambda checked, bp=bp_id: self.connector.set_vehicle_model(bp))
-            menu.addAction(action)
+        self._fill_menu(self.refs["menu_vehicle"], blueprints, self._on_vehicle_action)
+
+
+    @pyqtSlot()
+    def _on_vehicle_action(self):
+        """When selected, instruct the connector to use this vehicle model (ID in QAction.data())."""
+        self.connector.set_vehicle_model(self.sender().data())
 
 
     def _populate_map_menu(self):
         """Map‐Menu population"""
-        menu = self.refs["menu_map"]
-        menu.clear()
         # Nur die offiziellen Maps vom Server
-        for map_id in self._official_maps:
-           act = QAction(map_id, self)
-           act.triggered.connect(lambda _, m=map_id: self._on_map_selected(m))
-           menu.addAction(act)
+        self._fill_menu(self.refs["menu_map"], self._official_maps, self._on_map_action)
+
+
+    @pyqtSlot()
+    def _on_map_action(self):
+        """Map chosen in the menu (name in QAction.data())."""
+        self._on_map_selected(self.sender().data())
 
 
     @pyqtSlot(str)
@@ -402,21 +650,21 @@ class ControlPanel(QMainWindow):
         self.refs["label_vehicle"].setText(model_id)
 
 
+    @pyqtSlot()
     def _on_start_recording(self):
         """Disable the "Start" button, enable the "Stop" button, and start recording via the connector."""
         # Buttons update
-        self.refs["start_record_btn"].setEnabled(False)
-        self.refs["stop_record_btn"].setEnabled(True)
+        self._set_recording_buttons(True)
 
         # Record-Logic start
         self.connector.start_recording()
       
 
+    @pyqtSlot()
     def _on_stop_recording(self):
         """Re-enable the "Start" button, disable the "Stop" button, and stop recording via the connector."""
         # Buttons updaten
-        self.refs["start_record_btn"].setEnabled(True)
-        self.refs["stop_record_btn"].setEnabled(False)
+        self._set_recording_buttons(False)
 
         # Record-Logik terminate...
         self.connector.stop_recording()
@@ -425,53 +673,152 @@ class ControlPanel(QMainWindow):
     @pyqtSlot(bool)
     def _on_recording_status_changed(self, active: bool):
         """UI-Update"""
-        self.refs["start_record_btn"].setEnabled(not active)
-        self.refs["stop_record_btn"].setEnabled(active)
+        self._set_recording_buttons(active)
+
 
+    def _set_recording_buttons(self, active: bool):
+        """Enable exactly one of Start/Stop Recording, repainted together."""
+        start_btn, stop_btn = self.refs["start_record_btn"], self.refs["stop_record_btn"]
+        with self._batched_ui(start_btn, stop_btn):
+            start_btn.setEnabled(not active)
+            stop_btn.setEnabled(active)
 
 
-# Worker that polls the controller every 0.1s and emits a signal
-class InputWorker(QObject):
-    update_signal = pyqtSignal(dict, str)
+
+# Runs a callable on a QThreadPool thread and sets an Event when it is done
+class _Task(QRunnable):
+    def __init__(self, fn, done: threading.Event):
+        super().__init__()
+        self.fn = fn
+        self.done = done
+
+
+    def run(self):
+        try:
+            self.fn()
+        finally:
+            self.done.set()
+
+
+
+# Worker that writes the DataManager state to disk off the GUI thread
+class _PersistWorker(QObject):
+
+    def __init__(self, data_manager: DataManager):
+        super().__init__()
+        self.data = data_manager
+
+
+    @pyqtSlot()
+    def flush(self):
+        # One state.json write for all changes made since the last flush
+        self.data.save()
+
+
+
+# Worker that clones or pulls the SGG repository off the GUI thread
+class SggPullWorker(QObject):
+    finished = pyqtSignal(bool, str)
+    """
+    # Emits (success: bool, error message or "")
     """
-    # Emits a tuple: (current_controls: dict, device_name: str)
+    progress = pyqtSignal(str)
     """
+    # Emits the latest git progress line (at most every PROGRESS_INTERVAL seconds)
+    """
+
+    PROGRESS_INTERVAL = 0.2
 
-    def __init__(self, controller_manager):
+    def __init__(self):
         super().__init__()
-        self.cm = controller_manager
-        self._running = True
+        # running git process (None if none), killed by abort()
+        self._proc = None
 
 
     @pyqtSlot()
     def run(self):
-        # Main loop: while running, fetch mapped controls and emit them
-        while self._running:
-            current = self.cm.get_mapped_controls()
-            js = self.cm.current_joystick
-            device_name = js.get_name() if js else "–"
-            # Emit the current control states and joystick name to the UI.
-            self.update_signal.emit(current, device_name)
-            time.sleep(0.1)
+        GIT_URL = "https://github.com/less-lab-uva/carla_scene_graphs.git"
+        try:
+            if not SGG_DIR.exists():
+                print("📦 Cloning SGG repository...")
+                self._run_git(["git", "clone", "--progress", GIT_URL], cwd=CARLA_DIR.parent)
+            else:
+                print("🔄 Pulling latest SGG changes...")
+                self._run_git(["git", "pull", "--progress"], cwd=SGG_DIR)
+            self.finished.emit(True, "")
+        except Exception as e:
+            self.finished.emit(False, str(e))
 
 
-    def stop(self):
-        # Signal the loop to exit cleanly.
-        self._running = False
+    def _run_git(self, args, cwd):
+        """
+        Run git and forward its progress output (stderr, lines ended by \r or \n)
+        as progress signals. Raises RuntimeError with the last output on failure.
+        """
+        import subprocess   # only needed when the user pulls the SGG repo
+
+        tail = deque(maxlen=20)   # last lines, for the error message
+        last_emit = 0.0
+        proc = subprocess.Popen(
+            args, cwd=cwd,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.PIPE,
+            text=True,   # universal newlines: each \r progress update is its own line
+            # git writes UTF-8, independent of the (Windows) locale codec
+            encoding="utf-8", errors="replace"
+        )
+        self._proc = proc
+        try:
+            for line in proc.stderr:
+                line = line.strip()
+                if not line:
+                    continue
+                tail.append(line)
+                now = time.monotonic()
+                if now - last_emit >= self.PROGRESS_INTERVAL:
+                    last_emit = now
+                    self.progress.emit(line)
+        except BaseException:
+            # reading failed -> never leave git running behind
+            proc.kill()
+            raise
+        finally:
+            returncode = proc.wait()
+            proc.stderr.close()
+            self._proc = None
+        if returncode != 0:
+            raise RuntimeError("\n".join(tail))
+
+
+    def abort(self):
+        """
+        Called from the GUI thread on close: kill a hanging git process,
+        so _run_git returns (with an error) and the thread can end.
+        """
+        proc = self._proc
+        if proc is not None and proc.poll() is None:
+            proc.kill()
 
 
 
 # Event filter to detect when a QLineEdit loses focus.
+# One instance serves all watched widgets: mapping widget -> callback(widget).
 class FocusEventFilter(QObject):
-    def __init__(self, on_focus_lost_callback):
+    _FOCUS_OUT = QEvent.FocusOut
+
+    def __init__(self, mapping):
         super().__init__()
-        # Store the callback to invoke on focus loss.
-        self.on_focus_lost_callback = on_focus_lost_callback
+        # Store the callback to invoke on focus loss, per watched widget.
+        self.mapping = mapping
+        for widget in mapping:
+            widget.installEventFilter(self)
 
 
     def eventFilter(self, obj, event):
-        # If the event is a focus-out, call the provided callback.
-        if event.type() == QEvent.FocusOut:
-            self.on_focus_lost_callback(obj)
+        # Every event of the watched widgets passes here -> cheapest check first.
+        if event.type() == self._FOCUS_OUT:
+            callback = self.mapping.get(obj)
+            if callback:
+                callback(obj)
         # Return False to allow normal event propagation.
         return False  
\ No newline at end of file
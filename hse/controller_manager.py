@@ -2,7 +2,6 @@
 
 import sys
 import threading
-import time
 from pathlib import Path
 
 # Wenn das Modul direkt ausgeführt wird, sicherstellen, dass das Projekt-Root drin ist
@@ -18,14 +17,25 @@ from PyQt5.QtWidgets import (
     QGridLayout, QGroupBox, QProgressBar, QSizePolicy, QComboBox, QScrollArea,
     QPushButton, QCheckBox
 )
-from PyQt5.QtCore import QTimer, Qt, QObject
+from PyQt5.QtCore import QTimer, Qt, QObject, pyqtSignal
 from hse.data_manager import DataManager
 
-from hse.utils.settings import DEFAULT_VALUES
+from hse.utils.settings import DEFAULT_VALUES, CONTROLLER_JOIN_TIMEOUT
 
 
+# pygame events that mean "some joystick input changed"
+_JOY_EVENTS = (
+    pygame.JOYAXISMOTION, pygame.JOYBUTTONDOWN, pygame.JOYBUTTONUP,
+    pygame.JOYHATMOTION, pygame.JOYBALLMOTION,
+)
+# Max. time (ms) the scan thread blocks waiting for an input event,
+# bounds how long shutdown() waits for the thread
+_EVENT_WAIT_MS = 100
+
 
 class ControllerManager(QObject):
+    # emitted with the new device name whenever current_joystick is swapped
+    device_changed = pyqtSignal(str)
 
     def __init__(self, data_manager: DataManager):
         super().__init__()
@@ -106,6 +116,11 @@ class ControllerManager(QObject):
         if not self.current_joystick:
             print("No joystick available after checking active_controller.")
 
+        # Name of the active device, cached on every (re)assignment of current_joystick
+        # (get_name() decodes a fresh string per call on some SDL builds)
+        self.current_joystick_name = (self.current_joystick.get_name()
+                                      if self.current_joystick else "–")
+
         # Initialize raw state containers for the active joystick
         #   - raw_axes: axis_index -> Optional[float], starts at None until first read
         #   - raw_buttons: button_index -> int (0 or 1), starts at 0 (not pressed)
@@ -127,6 +142,10 @@ class ControllerManager(QObject):
             for func in self.controls_cfg
         }
 
+        # Bumped by the scan thread whenever the raw state was re-read,
+        # so pollers (ControlPanel input labels) can skip unchanged states
+        self.state_version = 0
+
         # Threading primitives for continuous background scanning
         self._lock = threading.Lock()
         self._running = True
@@ -135,23 +154,32 @@ class ControllerManager(QObject):
 
 
     def _scan_loop(self):
-        """Background thread: polls pygame and updates raw state dicts."""
+        """
+        Background thread: waits for pygame joystick events and updates the raw state dicts.
+        Blocks in pygame.event.wait() (at most _EVENT_WAIT_MS, to notice shutdown),
+        so an idle controller costs no reads at all; after an input event all
+        axes/buttons are read once. The first pass reads unconditionally.
+        """
+        changed = True
         while self._running:
+            if changed:
+                with self._lock:
+                    if self.current_joystick:
+                        # update each axis value (float in [-1.0, +1.0])
+                        for axis_current_joystick in list(self.raw_axes.keys()):
+                            self.raw_axes[axis_current_joystick] = self.current_joystick.get_axis(axis_current_joystick)
+                        # update each button state (int 0 or 1)
+                        for btn_idx in list(self.raw_buttons.keys()):
+                            self.raw_buttons[btn_idx] = int(self.current_joystick.get_button(btn_idx))
+                    self.state_version += 1
+
             try:
-                pygame.event.pump()
+                # block until the next event (or timeout), then take everything queued meanwhile
+                events = [pygame.event.wait(_EVENT_WAIT_MS)]
+                events.extend(pygame.event.get())
             except pygame.error:
                 break
-
-            with self._lock:
-                if self.current_joystick:
-                    # update each axis value (float in [-1.0, +1.0])
-                    for axis_current_joystick in list(self.raw_axes.keys()):
-                        self.raw_axes[axis_current_joystick] = self.current_joystick.get_axis(axis_current_joystick)
-                    # update each button state (int 0 or 1)
-                    for btn_idx in list(self.raw_buttons.keys()):
-                        self.raw_buttons[btn_idx] = int(self.current_joystick.get_button(btn_idx))
-
-            time.sleep(0.033)   # ~30Hz
+            changed = any(ev.type in _JOY_EVENTS for ev in events)
 
 
     def get_all_states(self):
@@ -167,34 +195,39 @@ class ControllerManager(QObject):
         """
         with self._lock:
             axes_out = {}
-            dev_name = (self.current_joystick.get_name()
-                        if self.current_joystick else None)
+            dev_name = self.current_joystick_name if self.current_joystick else None
 
             for axis_idx, raw in self.raw_axes.items():
                 if raw is None:
                     # never read yet
                     axes_out[axis_idx] = None
                     continue
+                axes_out[axis_idx] = self._styled_axis(dev_name, axis_idx, raw)
 
-                # look up axis metadata (guaranteed to have style/inverted)
-                meta = None
-                if dev_name:
-                    for a in self.known_devices[dev_name]["axes"]:
-                        if a["id"] == axis_idx:
-                            meta = a
-                            break
+            # buttons are already 0 or 1
+            return {"axes": axes_out, "buttons": dict(self.raw_buttons)}
 
-                # apply inversion
-                val = -raw if meta and meta["inverted"] else raw
 
-                # apply style
-                if meta and meta["style"] == "unipolar":
-                    val = (val + 1.0) / 2.0
+    def _styled_axis(self, dev_name: Optional[str], axis_idx: int, raw: float) -> float:
+        """
+        Apply the stored 'inverted' and 'style' flags of one axis to its raw value.
+        The metadata is looked up on every call (the visualizer edits it in place).
+        """
+        # look up axis metadata (guaranteed to have style/inverted)
+        meta = None
+        if dev_name:
+            for a in self.known_devices[dev_name]["axes"]:
+                if a["id"] == axis_idx:
+                    meta = a
+                    break
 
-                axes_out[axis_idx] = val
+        # apply inversion
+        val = -raw if meta and meta["inverted"] else raw
 
-            # buttons are already 0 or 1
-            return {"axes": axes_out, "buttons": dict(self.raw_buttons)}
+        # apply style
+        if meta and meta["style"] == "unipolar":
+            val = (val + 1.0) / 2.0
+        return val
 
 
     def get_mapped_controls(self) -> Dict[str, Optional[float]]:
@@ -222,29 +255,73 @@ class ControllerManager(QObject):
                 # No assignment, so no value
                 mapped[func] = None
         return mapped
+
+
+    def fill_mapped_controls(self, names, out) -> None:
+        """
+        Write the mapped value of each function in `names` into the
+        preallocated float array or list `out` (same order), so callers
+        (simulation tick, ControlPanel input labels) don't need a fresh dict per poll.
+        Only the mapped axes are styled (no full get_all_states() pass,
+        no intermediate dicts). Unmapped functions or values not read yet
+        are written as 0.0.
+        """
+        with self._lock:
+            dev_name = self.current_joystick_name if self.current_joystick else None
+            for i, func in enumerate(names):
+                cfg = self.controls_cfg.get(func)
+                mapping_type = cfg.get("type") if cfg else None
+                val = None
+                if mapping_type == "axis":
+                    raw = self.raw_axes.get(cfg.get("id"))
+                    if raw is not None:
+                        val = self._styled_axis(dev_name, cfg.get("id"), raw)
+                elif mapping_type == "button":
+                    val = self.raw_buttons.get(cfg.get("id"))
+                out[i] = 0.0 if val is None else val
  
 
     def set_mapping(self, func: str, mtype: str, idx: int):
         with self._lock:
             self.controls_cfg[func] = {"type": mtype, "id": idx}
             self.data.set("controls", self.controls_cfg)
+            # mapped values changed even without new input
+            self.state_version += 1
+
+
+    def set_axis_option(self, axis_idx: int, key: str, value):
+        """
+        Change one axis flag ("inverted" or "style") of the active device and persist it.
+        Styled values change even without new input -> bump state_version.
+        """
+        with self._lock:
+            for a in self.known_devices[self.current_joystick_name]["axes"]:
+                if a["id"] == axis_idx:
+                    a[key] = value
+                    break
+            self.data.set("known_devices", self.known_devices)
+            self.state_version += 1
 
 
     def set_device(self, index: int):
         with self._lock:
-            if self.joystick:
-                self.joystick.quit()
+            if self.current_joystick:
+                self.current_joystick.quit()
             js = pygame.joystick.Joystick(index)
             js.init()
-            self.joystick = js
+            self.current_joystick = js
+            self.current_joystick_name = js.get_name()
             # reset raw_axes/raw_buttons für neue Counts
             self.raw_axes = {i: 0.0 for i in range(js.get_numaxes())}
             self.raw_buttons = {j: False for j in range(js.get_numbuttons())}
+            self.state_version += 1
+        # outside the lock: slots may call back into the manager
+        self.device_changed.emit(self.current_joystick_name)
 
 
     def shutdown(self):
         self._running = False
-        self._thread.join(timeout=0.5)
+        self._thread.join(timeout=CONTROLLER_JOIN_TIMEOUT)
         if self.current_joystick:
             self.current_joystick.quit()
         pygame.quit()
@@ -272,7 +349,7 @@ if __name__ == "__main__":
             os.system("cls" if os.name == "nt" else "clear")
 
             # 3) Header
-            active = cm.current_joystick.get_name() if cm.current_joystick else "None"
+            active = cm.current_joystick_name
             print(f"Active joystick: {active}\n")
 
             # 4) Axes
@@ -7,6 +7,7 @@ root_path = Path(__file__).resolve().parent.parent
 sys.path.append(str(root_path))
 
 import datetime
+import threading
 from typing import Any, Dict
 from hse.utils.settings import CONFIG_PATH, DEFAULT_VALUES, CARLA_DIR, DATA_DIR, MAP_DIR
 
@@ -22,6 +23,8 @@ class DataManager:
     def __init__(self):
         self.state = {}
         self.carla_versions: list[str] = []
+        # Serializes state updates and file writes (set() is called from GUI and worker threads)
+        self._save_lock = threading.RLock()
         self._validate_and_load()
         self._scan_carla_versions()             
 
@@ -118,7 +121,7 @@ class DataManager:
         """
         try:
             path.parent.mkdir(parents=True, exist_ok=True)
-            with open(path, "w", encoding="utf-8") as f:
+            with self._save_lock, open(path, "w", encoding="utf-8") as f:
                 json.dump(data, f, indent=4)
         except Exception as e:
             print(f"Error saving {path.name}: {e}")
@@ -136,15 +139,27 @@ class DataManager:
         return self.state.get(key, default)
 
 
-    def set(self, key: str, value: Any) -> None:
+    def set(self, key: str, value: Any, save: bool = True) -> None:
         """
-        Assign a new value in state and immediately persist to disk.
+        Assign a new value in state and (by default) immediately persist to disk.
         Args:
             key (str): Configuration key.
             value (Any): Value to store.
+            save (bool): False only updates the in-memory state; a later save() writes it.
         """
-        self.state[key] = value
-        self._save_json(CONFIG_PATH, self.state)
+        with self._save_lock:
+            self.state[key] = value
+            if save:
+                self._save_json(CONFIG_PATH, self.state)
+
+
+    def save(self) -> None:
+        """
+        Persist the current in-memory state to disk.
+        Used to write several set(..., save=False) changes at once.
+        """
+        with self._save_lock:
+            self._save_json(CONFIG_PATH, self.state)
 
 
     def _scan_carla_versions(self) -> None:
@@ -9,9 +9,20 @@ from PyQt5.QtCore import Qt
 from hse.utils.settings import DEFAULT_VALUES  # <-- Importiere die Default-Controls
 
 
+# Status label colors, selected by the dynamic "state" property of a label
+# (ok / busy / error); switching state only re-polishes, no stylesheet is parsed
+STATUS_QSS = """
+QLabel[state="ok"]    { color: green;  font-weight: bold; }
+QLabel[state="busy"]  { color: orange; font-weight: bold; }
+QLabel[state="error"] { color: red;    font-weight: bold; }
+"""
+
+
 def build_ui(window):
     window.setWindowTitle("CARLA Control Panel")
     window.setGeometry(100, 100, 951, 678)
+    # one window-wide sheet for all status labels
+    window.setStyleSheet(STATUS_QSS)
     refs = {}
 
     # === Zentral-Widget ===
@@ -24,7 +35,8 @@ def build_ui(window):
     layout_connector = QFormLayout(group_connector)
 
     label_status = QLabel("Disconnected", group_connector)
-    label_status.setStyleSheet("color: red; font-weight: bold;")
+    label_status.setObjectName("label_status")
+    label_status.setProperty("state", "error")
     layout_connector.addRow("Status:", label_status)
 
     input_ip = QLineEdit("localhost", group_connector)
@@ -74,7 +86,8 @@ def build_ui(window):
     layout_sgg = QFormLayout(group_sgg)
 
     label_sgg_status = QLabel("nicht geladen", group_sgg)
-    label_sgg_status.setStyleSheet("color: red; font-weight: bold;")
+    label_sgg_status.setObjectName("label_sgg_status")
+    label_sgg_status.setProperty("state", "error")
     layout_sgg.addRow("Status:", label_sgg_status)
     
 #    checkbox_graph1 = QCheckBox("Graph 1", group_sgg)
@@ -0,0 +1,57 @@
+# hse/utils/camera_math.py
+
+"""
+Small numeric kernels for the per-tick spectator update.
+Compiled with Numba if it is installed, otherwise plain Python
+(numba is optional and not part of requirements.txt).
+"""
+
+import math
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+    def njit(*args, **kwargs):
+        """No-op stand-in for numba.njit(...) used as decorator factory."""
+        def wrap(fn):
+            return fn
+        return wrap
+
+
+@njit(cache=True, fastmath=True)
+def world_offset(pitch, yaw, roll, lx, ly, lz):
+    """
+    Rotate the local offset (lx, ly, lz) by a CARLA rotation (degrees) into world space.
+    The basis vectors are computed exactly like Transform.get_forward_vector() /
+    get_right_vector() / get_up_vector(), so only three angles have to cross
+    the pybind11 boundary instead of nine vector components.
+    Returns (x, y, z).
+    """
+    p = math.radians(pitch)
+    y = math.radians(yaw)
+    r = math.radians(roll)
+    cp, sp = math.cos(p), math.sin(p)
+    cy, sy = math.cos(y), math.sin(y)
+    cr, sr = math.cos(r), math.sin(r)
+
+    # forward (f), right (r), up (u) vector
+    fx, fy, fz = cp * cy, cp * sy, sp
+    rx, ry, rz = cy * sp * sr - sy * cr, sy * sp * sr + cy * cr, -cp * sr
+    ux, uy, uz = -cy * sp * cr - sy * sr, -sy * sp * cr + cy * sr, cp * cr
+
+    return (
+        fx * lx + rx * ly + ux * lz,
+        fy * lx + ry * ly + uy * lz,
+        fz * lx + rz * ly + uz * lz,
+    )
+
+
+def warm_up() -> None:
+    """
+    Trigger JIT compilation (or load it from the cache) once,
+    so the first call on the tick thread does not pay for it.
+    """
+    world_offset(0.0, 0.0, 0.0, 0.0, 0.0, 0.0)
@@ -161,17 +161,11 @@ class JoystickVisualizer(QWidget):
 
     def _on_axis_invert_changed(self, axis_idx: int, flag: bool):
         """Update inversion setting."""
-        name = self.cm.current_joystick.get_name()
-        for a in self.cm.known_devices[name]["axes"]:
-            if a["id"] == axis_idx: a["inverted"] = flag; break
-        self.cm.data.set("known_devices", self.cm.known_devices)
+        self.cm.set_axis_option(axis_idx, "inverted", flag)
 
     def _on_axis_style_changed(self, axis_idx: int, style: str):
         """Update style setting."""
-        name = self.cm.current_joystick.get_name()
-        for a in self.cm.known_devices[name]["axes"]:
-            if a["id"] == axis_idx: a["style"] = style; break
-        self.cm.data.set("known_devices", self.cm.known_devices)
+        self.cm.set_axis_option(axis_idx, "style", style)
 
     def _on_set_clicked(self):
         """Enter binding mode."""
@@ -0,0 +1,74 @@
+# hse/utils/ring_buffer.py
+
+"""
+Fixed-size single-producer / single-consumer ring buffer used to hand off
+work from the CARLA simulation thread to the recording worker without locks.
+"""
+
+from typing import Any, List, Optional
+
+
+class SpscRingBuffer:
+    """
+    Lock-free ring buffer for exactly ONE producer thread and ONE consumer thread.
+
+    The producer only ever writes `_head`, the consumer only ever writes `_tail`.
+    Both counters grow monotonically; the slot index is `counter % capacity`.
+    A slot is always filled BEFORE `_head` is published and emptied BEFORE
+    `_tail` is published, so each side only sees fully written slots.
+    (Single reference/int stores are atomic in CPython.)
+    """
+
+    def __init__(self, capacity: int):
+        if capacity <= 0:
+            raise ValueError("capacity must be > 0")
+        self._capacity = capacity
+        # Pre-allocated slots, never resized
+        self._slots: List[Any] = [None] * capacity
+        # Next slot to write (owned by producer)
+        self._head = 0
+        # Next slot to read (owned by consumer)
+        self._tail = 0
+
+
+    @property
+    def capacity(self) -> int:
+        return self._capacity
+
+
+    def push(self, item: Any) -> bool:
+        """
+        Producer side: store item in the next free slot.
+        Returns False (and drops nothing) if the buffer is full.
+        """
+        head = self._head
+        if head - self._tail >= self._capacity:
+            return False
+        self._slots[head % self._capacity] = item
+        # publish the slot to the consumer
+        self._head = head + 1
+        return True
+
+
+    def pop(self) -> Optional[Any]:
+        """
+        Consumer side: take the oldest item, or None if the buffer is empty.
+        """
+        tail = self._tail
+        if tail == self._head:
+            return None
+        idx = tail % self._capacity
+        item = self._slots[idx]
+        # release the reference so the slot does not keep the item alive
+        self._slots[idx] = None
+        # hand the slot back to the producer
+        self._tail = tail + 1
+        return item
+
+
+    def empty(self) -> bool:
+        return self._tail == self._head
+
+
+    def __len__(self) -> int:
+        return self._head - self._tail
@@ -21,8 +21,28 @@ MAP_DIR   = ROOT_DIR / "hse" / "maps"
 # === Simulation parameters ===
 SGG_FPS = 20.0
 SGG_RENDER_DIST = 20 #Default is 50
-QUEUE_WORKER_COUNT: int = 4 #Threads used for recording SG Frames
+RECORD_BUFFER_SECONDS: float = 2.0 # max. backlog of the record worker (older world state is useless for SGG)
+RECORD_QUEUE_SIZE: int = max(1, round(RECORD_BUFFER_SECONDS * SGG_FPS)) # slots in the SGG record ring buffer, one frame each (frames beyond are dropped)
+CARLA_FIXED_DELTA: float = 0.01 # sync-mode step, recommended from CARLA -> DO NOT INCREASE or physics become weird!
+CARLA_TICK_TIMEOUT: float = 2.0 # RPC timeout (s) once connected; the "timeout" state value is only used for connect and map loading
 CARLA_FPS: int = 20 # not in use
+MAX_VEHICLES: int = 20 # spawned vehicles kept alive; the oldest one is destroyed when another is spawned
+PERSIST_INTERVAL: float = 0.1 # min. seconds between two state.json writes from the connector (changes in between are coalesced)
+ERROR_LOG_SIZE: int = 64 # worker/sim-thread messages kept until the GUI thread prints them (oldest dropped)
+ERROR_LOG_INTERVAL_MS: int = 500 # how often the GUI thread prints the collected messages
+FRAME_PROGRESS_INTERVAL_MS: int = 100 # how often frame_recorded reports the number of frames recorded (saved) in the current session to the GUI
+INPUT_POLL_INTERVAL_MS: int = 100 # how often the ControlPanel input section reads the mapped controls
+SIM_JOIN_TIMEOUT: float = 1.0 # max. seconds CarlaConnector.shutdown() waits for the simulation thread
+PERSIST_JOIN_TIMEOUT: float = 1.0 # max. seconds CarlaConnector.shutdown() waits for its persist thread
+RECORD_JOIN_TIMEOUT: float = 2.0 # max. seconds CarlaConnector.shutdown() waits for EACH recording thread (generation, save)
+CONTROLLER_JOIN_TIMEOUT: float = 0.5 # max. seconds ControllerManager.shutdown() waits for its scan thread
+# max. seconds the ControlPanel waits for connector/controller shutdown on close:
+# disconnect() RPCs + all joins above, so the panel never gives up before the backends are down
+SHUTDOWN_TIMEOUT: float = (CARLA_TICK_TIMEOUT + SIM_JOIN_TIMEOUT + PERSIST_JOIN_TIMEOUT
+                           + 2 * RECORD_JOIN_TIMEOUT + CONTROLLER_JOIN_TIMEOUT)
+SGG_PULL_CLOSE_TIMEOUT: float = 10.0 # max. seconds a running SGG git clone/pull may still take on close, then git is killed
+SGG_PULL_KILL_TIMEOUT: float = 1.0 # max. seconds to wait for the pull thread after killing git
+PANEL_SAVE_DELAY_MS: int = 250 # ControlPanel field edits within this time are written to state.json together
 
 
 # === Camera preset ===